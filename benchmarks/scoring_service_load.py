@@ -0,0 +1,132 @@
+import argparse
+import http.client
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlparse
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 로컬 스코어링 서비스 부하 테스트: 동시 클라이언트가 학생 한 명씩 POST /score 요청
+
+
+def load_records(data_path):
+    data = pd.read_csv(data_path, dtype={"학번": str})
+    # JSON 으로 보낼 수 있도록 numpy 타입/결측치를 파이썬 기본 타입으로 변환
+    return json.loads(data.to_json(orient="records", force_ascii=False))
+
+
+def run_client(host, port, records, count, offset, latencies, errors):
+    connection = http.client.HTTPConnection(host, port, timeout=30)
+    for i in range(count):
+        body = json.dumps(records[(offset + i) % len(records)], ensure_ascii=False).encode("utf-8")
+        start = time.perf_counter()
+        try:
+            connection.request("POST", "/score", body, {"Content-Type": "application/json"})
+            response = connection.getresponse()
+            response.read()
+            if response.status != 200:
+                errors.append(response.status)
+                continue
+        except (OSError, http.client.HTTPException) as e:
+            errors.append(str(e))
+            connection.close()
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            continue
+        latencies.append(time.perf_counter() - start)
+    connection.close()
+
+
+def run_load(url, records, concurrency, total_requests):
+    """
+    concurrency 개의 클라이언트 스레드로 total_requests 건을 보내고 지연 시간/처리량을 반환.
+    """
+    parsed = urlparse(url)
+    latencies, errors = [], []
+    per_client = total_requests // concurrency
+    threads = [
+        threading.Thread(
+            target=run_client,
+            args=(parsed.hostname, parsed.port, records, per_client, i * per_client, latencies, errors),
+        )
+        for i in range(concurrency)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else float("nan"),
+        "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else float("nan"),
+        "throughput_rps": len(latencies) / elapsed,
+    }
+
+
+def fetch_stats(url):
+    parsed = urlparse(url)
+    connection = http.client.HTTPConnection(parsed.hostname, parsed.port, timeout=10)
+    connection.request("GET", "/stats")
+    stats = json.loads(connection.getresponse().read())
+    connection.close()
+    return stats
+
+
+def print_report(label, result, server_stats):
+    print(
+        f"{label:<20}{result['requests']:>8}{result['errors']:>6}"
+        f"{result['p50_ms']:>10.2f}{result['p99_ms']:>10.2f}{result['throughput_rps']:>12.1f}"
+        f"{server_stats['mean_batch_size']:>12.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 스코어링 서비스의 지연 시간(p50/p99)과 처리량을 측정합니다.")
+    parser.add_argument("data", help="요청에 사용할 학생 데이터 (.csv)")
+    parser.add_argument("--url", default=None, help="이미 실행 중인 서비스 주소 (예: http://127.0.0.1:8502)")
+    parser.add_argument("--model", default="job_success_weighted_model_final.joblib",
+                        help="--url 이 없을 때 같은 프로세스에서 서비스를 띄울 모델 (.joblib)")
+    parser.add_argument("--concurrency", type=int, default=32, help="동시 클라이언트 수")
+    parser.add_argument("--requests", type=int, default=2000, help="총 요청 수")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="배치를 모으는 최대 대기 시간 (ms)")
+    parser.add_argument("--max-batch", type=int, default=64, help="마이크로 배치 최대 크기")
+    args = parser.parse_args()
+
+    records = load_records(args.data)
+    print(f"{'설정':<20}{'요청':>8}{'오류':>6}{'p50 (ms)':>10}{'p99 (ms)':>10}{'처리량 (rps)':>12}{'평균 배치':>12}")
+
+    if args.url:
+        result = run_load(args.url, records, args.concurrency, args.requests)
+        print_report("외부 서비스", result, fetch_stats(args.url))
+        return
+
+    import joblib
+    from services.scoring_service import create_server
+
+    model = joblib.load(args.model)
+    # 배치 없이 한 건씩 처리하는 경우와 마이크로 배치를 비교
+    for label, max_batch, max_wait_ms in [
+        ("배치 없음", 1, 0.0),
+        (f"배치 {args.max_batch}/{args.max_wait_ms:g}ms", args.max_batch, args.max_wait_ms),
+    ]:
+        server = create_server(model, port=0, max_batch_size=max_batch, max_wait_ms=max_wait_ms)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        result = run_load(url, records, args.concurrency, args.requests)
+        print_report(label, result, fetch_stats(url))
+        server.shutdown()
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
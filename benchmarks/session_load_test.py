@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 동시 세션 부하 테스트: 세션 N개가 동시에 네 페이지를 차례로 열 때의 페이지별 지연 시간과 세션당 메모리 측정
+# 조합(세션 수 x 학생 수)마다 새 프로세스에서 실행해 캐시와 메모리를 분리
+APP_PATH = str(Path(__file__).resolve().parent.parent / "streamlit_app.py")
+PAGES = ["모델/데이터 불러오기", "취업 성취 스코어", "그룹별 특성 상세 보기", "개인별 상세 분석"]
+# 모델이 없을 때 합성 데이터와 합성 모델에 사용하는 특성 (배포 모델의 feature_names_in_ 과 동일)
+DEFAULT_FEATURES = [
+    "소득분위", "교과환산점수_2단계", "전공", "학년", "재학학기", "휴학학기", "전체학사경고횟수", "연속학사경고횟수",
+    "학사경고과목수", "대학백분위점수", "대학취득학점", "비교과_참여시간", "동아리수", "자격증수", "토익수준", "수상빈도",
+    "전공체험_소요시간", "근로장학_근무시간", "일경험_근로시간", "생활관일수", "생활관상벌점수", "교수교류빈도", "선후배교류",
+    "친구교류", "교외교류", "학습성과수준", "전체만족도", "교과만족도", "비교과만족도", "대학생활만족도", "대학소속감",
+    "전공소속감", "창의융합", "문제해결", "의사소통", "리더십", "학습지도", "전공기초", "전공전문성", "자기관리", "대인관계",
+    "글로벌시민의식", "비교과", "일경험", "교류", "역량", "비교과수준", "일경험수준", "교류수준", "역량수준", "성적수준",
+    "중도탈락최소", "중도탈락최대",
+]
+# AppTest 는 실행할 때마다 전역 런타임 객체를 바꿔 끼우므로 한 프로세스에서 동시에 실행하면 세션끼리 충돌함.
+# 스크립트 실행만 직렬화하고 대기 시간은 지연 시간에 포함 (GIL 에 묶인 실제 서버 스레드와 비슷한 최악의 경우)
+APP_TEST_LOCK = threading.Lock()
+
+
+def make_cohort(features, n_students, seed=0):
+    """
+    학번/이름과 모델 특성을 갖는 합성 학생 데이터.
+    """
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({feature: rng.integers(0, 6, n_students) for feature in features})
+    data["대학백분위점수"] = rng.uniform(0, 100, n_students).round(1)
+    data["전공"] = rng.integers(1, 8, n_students)
+    data["학년"] = rng.integers(1, 5, n_students)
+    data.insert(0, "이름", [f"학생{i}" for i in range(n_students)])
+    data.insert(0, "학번", [f"{seed:02d}{i:07d}" for i in range(n_students)])
+    return data
+
+
+def make_model(features, n_students=3000):
+    from sklearn.ensemble import RandomForestClassifier
+
+    data = make_cohort(features, n_students, seed=99)
+    labels = (data["대학백분위점수"] // 34).astype(int)
+    return RandomForestClassifier(n_estimators=50, max_depth=10, random_state=0).fit(data[features], labels)
+
+
+def current_rss():
+    # 리눅스는 현재 RSS, 그 외에는 최대 RSS 로 대신함
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        import resource
+
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def run_session(model_bytes, csv_bytes, barrier, results):
+    """
+    세션 하나가 업로드 페이지부터 개인별 상세 분석까지 차례로 이동하며 페이지별 실행 시간을 기록.
+    """
+    import joblib
+    import pandas as pd
+    from streamlit.testing.v1 import AppTest
+    from components.dataset_store import bytes_hash, get_dataset_store
+
+    timings, errors = {}, []
+    app = AppTest.from_file(APP_PATH, default_timeout=600)
+    barrier.wait()
+    try:
+        start = time.perf_counter()
+        with APP_TEST_LOCK:
+            app.run()
+        # 업로드 위젯은 AppTest 로 조작할 수 없으므로 업로드 처리와 같은 방식으로 세션 상태에 주입
+        data_key = bytes_hash(csv_bytes)
+        get_dataset_store().get_or_put(data_key, lambda: pd.read_csv(BytesIO(csv_bytes), dtype={"학번": str}))
+        app.session_state["model"] = joblib.load(BytesIO(model_bytes))
+        app.session_state["uploaded_data_key"] = data_key
+        with APP_TEST_LOCK:
+            app.run()
+        timings[PAGES[0]] = time.perf_counter() - start
+        errors.extend(str(exception.value) for exception in app.exception)
+
+        for page in PAGES[1:]:
+            start = time.perf_counter()
+            with APP_TEST_LOCK:
+                app.sidebar.radio[0].set_value(page).run()
+            timings[page] = time.perf_counter() - start
+            errors.extend(str(exception.value) for exception in app.exception)
+    except Exception as e:
+        errors.append(repr(e))
+    results.append({"timings": timings, "errors": errors})
+
+
+def run_scenario(n_sessions, n_students, model_path=None, distinct_data=False):
+    """
+    같은 프로세스(서버 한 대) 안에서 세션 n_sessions 개를 동시에 실행.
+    """
+    import joblib
+
+    if model_path:
+        with open(model_path, "rb") as model_file:
+            model_bytes = model_file.read()
+        features = list(joblib.load(BytesIO(model_bytes)).feature_names_in_)
+    else:
+        buffer = BytesIO()
+        joblib.dump(make_model(DEFAULT_FEATURES), buffer)
+        model_bytes, features = buffer.getvalue(), DEFAULT_FEATURES
+
+    # 기본은 모든 세션이 같은 학생 데이터를 올리는 경우, distinct_data 면 세션마다 다른 데이터
+    csv_payloads = [
+        make_cohort(features, n_students, seed=i if distinct_data else 0).to_csv(index=False).encode("utf-8")
+        for i in range(n_sessions if distinct_data else 1)
+    ]
+
+    # 앱 모듈을 미리 한 번 import 해서 첫 세션만 import 비용을 떠안지 않도록 함
+    from streamlit.testing.v1 import AppTest
+    import components.filters  # noqa: F401
+    import components.recommendations  # noqa: F401
+
+    AppTest.from_file(APP_PATH, default_timeout=600).run()
+    rss_before = current_rss()
+
+    results = []
+    barrier = threading.Barrier(n_sessions)
+    threads = [
+        threading.Thread(target=run_session, args=(model_bytes, csv_payloads[i % len(csv_payloads)], barrier, results))
+        for i in range(n_sessions)
+    ]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    return {
+        "sessions": n_sessions,
+        "students": n_students,
+        "elapsed": elapsed,
+        "rss_per_session": (current_rss() - rss_before) / n_sessions,
+        "timings": {page: [result["timings"][page] for result in results if page in result["timings"]] for page in PAGES},
+        "errors": [error for result in results for error in result["errors"]],
+    }
+
+
+def run_child(n_sessions, n_students, model_path, distinct_data):
+    command = [sys.executable, __file__, "--child", str(n_sessions), str(n_students)]
+    if model_path:
+        command += ["--model", model_path]
+    if distinct_data:
+        command.append("--distinct-data")
+    # 스코어 이력/스냅샷 등이 실제 캐시 디렉터리에 쌓이지 않도록 임시 디렉터리 사용
+    with tempfile.TemporaryDirectory() as cache_root:
+        env = {**os.environ, "JOB_SUC_CACHE_DIR": cache_root}
+        output = subprocess.run(command, capture_output=True, text=True, check=True, env=env).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="동시 세션 수와 학생 수에 따른 페이지별 지연 시간과 세션당 메모리를 측정합니다.")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8], help="동시 세션 수 목록")
+    parser.add_argument("--students", type=int, nargs="+", default=[1000, 10000], help="학생 수 목록")
+    parser.add_argument("--model", default=None, help="사용할 모델 (.joblib), 없으면 합성 모델을 학습")
+    parser.add_argument("--distinct-data", action="store_true", help="세션마다 서로 다른 학생 데이터를 업로드")
+    parser.add_argument("--child", nargs=2, type=int, default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(args.child[0], args.child[1], args.model, args.distinct_data)
+        print(json.dumps(result, ensure_ascii=False))
+        return
+
+    print(f"{'세션':>4}{'학생':>8}  {'페이지':<16}{'p50 (ms)':>10}{'p95 (ms)':>10}{'p99 (ms)':>10}{'세션당 메모리 (MB)':>20}")
+    for n_students in args.students:
+        for n_sessions in args.sessions:
+            result = run_child(n_sessions, n_students, args.model, args.distinct_data)
+            for page in PAGES:
+                latencies = np.array(result["timings"][page]) * 1000
+                if not len(latencies):
+                    continue
+                p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+                # 세션당 메모리는 조합마다 한 번만 표시
+                memory = f"{result['rss_per_session'] / 1024 ** 2:.1f}" if page == PAGES[0] else ""
+                print(f"{n_sessions:>4}{n_students:>8}  {page:<16}{p50:>10.0f}{p95:>10.0f}{p99:>10.0f}{memory:>20}")
+            for error in result["errors"][:3]:
+                print(f"  예외: {error[:200]}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
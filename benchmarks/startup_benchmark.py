@@ -0,0 +1,87 @@
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# 페이지별 첫 렌더링 시간(콜드 스타트) 측정: 페이지마다 새 프로세스에서 실행
+APP_PATH = str(Path(__file__).resolve().parent.parent / "streamlit_app.py")
+PAGES = ["모델/데이터 불러오기", "취업 성취 스코어", "그룹별 특성 상세 보기", "개인별 상세 분석"]
+
+
+def measure_page(page, model_path=None, data_path=None):
+    """
+    새 프로세스 안에서 앱을 처음 실행한 뒤 page 로 이동해 렌더링 시간을 측정.
+    """
+    start = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=300)
+    app.run()
+    initial_run = time.perf_counter() - start
+    modules_before = len(sys.modules)
+
+    if model_path and data_path:
+        # 업로드 위젯은 AppTest 로 조작할 수 없으므로 세션 상태에 직접 주입 (pandas/joblib 은 미리 로드됨)
+        import joblib
+        import pandas as pd
+        from components.dataset_store import get_dataset_store
+
+        app.session_state["model"] = joblib.load(model_path)
+        app.session_state["uploaded_data_key"] = get_dataset_store().put(pd.read_csv(data_path, dtype={"학번": str}))
+        modules_before = len(sys.modules)
+
+    page_render = 0.0
+    if page != PAGES[0]:
+        start = time.perf_counter()
+        app.sidebar.radio[0].set_value(page).run()
+        page_render = time.perf_counter() - start
+
+    return {
+        "page": page,
+        "initial_run": initial_run,
+        "page_render": page_render,
+        "time_to_first_render": page_render if page != PAGES[0] else initial_run,
+        "modules_imported": len(sys.modules) - modules_before,
+        "exceptions": [str(exception.value) for exception in app.exception],
+    }
+
+
+def run_child(page, model_path, data_path):
+    command = [sys.executable, __file__, "--child", page]
+    if model_path and data_path:
+        command += ["--model", model_path, "--data", data_path]
+    output = subprocess.run(command, capture_output=True, text=True, check=True).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="페이지별 콜드 스타트 렌더링 시간을 측정합니다.")
+    parser.add_argument("--repeats", type=int, default=3, help="페이지별 반복 측정 횟수")
+    parser.add_argument("--model", default=None, help="세션에 주입할 모델 (.joblib)")
+    parser.add_argument("--data", default=None, help="세션에 주입할 데이터 (.csv)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure_page(args.child, args.model, args.data), ensure_ascii=False))
+        return
+
+    print(f"{'페이지':<16}{'첫 렌더링 (ms)':>16}{'초기 실행 (ms)':>16}{'추가 import 모듈':>18}")
+    for page in PAGES:
+        results = [run_child(page, args.model, args.data) for _ in range(args.repeats)]
+        for result in results:
+            for exception in result["exceptions"]:
+                print(f"  [{page}] 예외: {exception}", file=sys.stderr)
+        first_render = statistics.median(result["time_to_first_render"] for result in results) * 1000
+        initial_run = statistics.median(result["initial_run"] for result in results) * 1000
+        modules = statistics.median(result["modules_imported"] for result in results)
+        print(f"{page:<16}{first_render:>16.1f}{initial_run:>16.1f}{modules:>18.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import uuid
+
+# 여러 세션/프로세스가 함께 쓰는 Arrow IPC 파일 읽기/쓰기 (스냅샷, 샤드 스코어링 공용)
+# (이 모듈을 import 하는 것만으로 pyarrow 를 불러오지 않도록 함수 안에서 import)
+TEMP_SUFFIX = ".tmp"
+
+
+def write_atomic(path, write):
+    # 다른 세션/프로세스가 읽는 도중에 덮어쓰지 않도록 쓰기마다 다른 이름의 임시 파일에 쓴 뒤 교체
+    temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}{TEMP_SUFFIX}")
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    finally:
+        temp_path.unlink(missing_ok=True)
+
+
+def write_table(table, path):
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    def write(temp_path):
+        with pa.OSFile(str(temp_path), "wb") as sink:
+            with ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+    write_atomic(path, write)
+
+
+def write_dataframe(data, path):
+    import pyarrow as pa
+
+    write_table(pa.Table.from_pandas(data, preserve_index=False), path)
+
+
+def read_table(path):
+    """
+    메모리 맵으로 읽으므로 파일 크기와 무관하게 빠르고, 대부분 복사 없이 사용됨.
+    """
+    import pyarrow as pa
+    import pyarrow.ipc as ipc
+
+    return ipc.open_file(pa.memory_map(str(path))).read_all()
@@ -0,0 +1,11 @@
+import os
+from pathlib import Path
+
+# 앱이 디스크에 저장하는 캐시/이력 파일의 기본 위치
+CACHE_ROOT = Path(os.environ.get("JOB_SUC_CACHE_DIR", ".cache"))
+
+
+def cache_dir(name):
+    path = CACHE_ROOT / name
+    path.mkdir(parents=True, exist_ok=True)
+    return path
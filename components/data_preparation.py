@@ -1,3 +1,11 @@
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
 def prepare_data(data, model):
     if hasattr(model, "feature_names_in_"):
         required_features = list(model.feature_names_in_)
@@ -7,14 +15,155 @@ def prepare_data(data, model):
         data = data[required_features]
     return data
 
+def model_hash(model):
+    # 트리 구조(노드/값 배열) 기준으로 해시해야 같은 모델을 다시 불러와도 값이 같음
+    # (부스팅 모델의 estimators_ 는 단계 x 클래스 형태의 ndarray)
+    digest = hashlib.sha256()
+    estimators = getattr(model, "estimators_", None)
+    if isinstance(estimators, np.ndarray):
+        estimators = list(estimators.ravel())
+    if not isinstance(estimators, list) or not estimators:
+        estimators = [model]
+    for estimator in estimators:
+        tree = getattr(estimator, "tree_", None)
+        if tree is None:
+            digest.update(joblib.hash(estimator).encode())
+            continue
+        tree_state = tree.__getstate__()
+        for key in sorted(tree_state):
+            value = tree_state[key]
+            # 노드 구조체 배열의 패딩 바이트는 값이 일정하지 않으므로 필드별로 해시
+            fields = getattr(getattr(value, "dtype", None), "names", None) or [None]
+            for field in fields:
+                digest.update(joblib.hash(value if field is None else value[field].copy()).encode())
+    for attr in ("feature_names_in_", "classes_"):
+        if hasattr(model, attr):
+            digest.update(joblib.hash(getattr(model, attr)).encode())
+    return digest.hexdigest()[:16]
+
 def predict_success(model, data):
     probabilities = model.predict_proba(data) * 100 if hasattr(model, "predict_proba") else None
     return probabilities
 
-def categorize_performance(score):
-    if score >= 70:
-        return "고성취"
-    elif score >= 10:
-        return "중성취"
-    else:
-        return "저성취"
\ No newline at end of file
+SUCCESS_CLASS_INDEX = 1
+SPREAD_Z = 1.645  # 트리 평균 스코어의 90% 구간 (정규 근사)
+SPREAD_CHUNK_ROWS = 20_000  # (트리 수 x 행 수) 중간 행렬 크기를 제한
+SPREAD_COLUMNS = ["스코어 표준편차 (%p)", "스코어 구간 하한 (%)", "스코어 구간 상한 (%)"]
+UNCERTAIN_COLUMN = "성취 수준 불확실"
+
+def predict_success_with_spread(model, data):
+    """
+    (확률(%), 트리 간 분산) 반환. 랜덤 포레스트/엑스트라 트리는 트리마다 한 번씩만 예측해서
+    평균 확률(= predict_proba)과 성공 확률의 트리 간 표준편차, 평균 스코어의 구간([표준편차, 하한, 상한] 열)을
+    함께 계산. 깊은 트리의 개별 확률은 0/100 에 몰리므로 구간은 트리별 분위수가 아니라 평균의 표준오차로 계산.
+    다른 모델(부스팅, 배깅 등)은 predict_proba 결과와 None.
+    """
+    from sklearn.ensemble import ExtraTreesClassifier, RandomForestClassifier
+
+    if not isinstance(model, (RandomForestClassifier, ExtraTreesClassifier)) or getattr(model, "n_outputs_", 1) != 1:
+        return predict_success(model, data), None
+    trees = model.estimators_
+    values = np.ascontiguousarray(data, dtype=np.float32)
+    probabilities = np.empty((len(values), len(model.classes_)))
+    spread = np.empty((len(values), len(SPREAD_COLUMNS)))
+    for start in range(0, len(values), SPREAD_CHUNK_ROWS):
+        chunk = values[start:start + SPREAD_CHUNK_ROWS]
+        per_tree = np.stack([tree.predict_proba(chunk, check_input=False) for tree in trees]) * 100
+        probabilities[start:start + len(chunk)] = per_tree.mean(axis=0)
+        spread[start:start + len(chunk), 0] = per_tree[:, :, SUCCESS_CLASS_INDEX].std(axis=0)
+    margin = SPREAD_Z * spread[:, 0] / np.sqrt(len(trees))
+    spread[:, 1] = np.clip(probabilities[:, SUCCESS_CLASS_INDEX] - margin, 0, 100)
+    spread[:, 2] = np.clip(probabilities[:, SUCCESS_CLASS_INDEX] + margin, 0, 100)
+    return probabilities, spread
+
+SCORE_COLUMN = "취업 성공 가능 스코어 (%)"
+TIER_LABELS = ["저성취", "중성취", "고성취"]
+HIGH_TIER = TIER_LABELS[-1]
+TIER_CUT_POINTS = (10, 70)  # 중성취, 고성취가 시작되는 스코어
+
+def assign_tiers(scores, cut_points=TIER_CUT_POINTS):
+    # 스코어 전체를 한 번에 구간화해 순서형 범주(저성취 < 중성취 < 고성취)로 반환, 결측 스코어는 결측
+    scores = np.asarray(scores, dtype=np.float64)
+    codes = np.digitize(scores, cut_points)
+    codes[np.isnan(scores)] = -1
+    return pd.Categorical.from_codes(codes, categories=TIER_LABELS, ordered=True)
+
+def uncertain_tiers(lower, upper, cut_points=TIER_CUT_POINTS):
+    # 평균 스코어 구간의 양 끝이 다른 성취 수준에 속하면(구간이 기준 스코어에 걸치면) 불확실
+    return np.digitize(np.asarray(lower, dtype=np.float64), cut_points) != np.digitize(
+        np.asarray(upper, dtype=np.float64), cut_points
+    )
+
+def apply_tiers(scored, cut_points=TIER_CUT_POINTS):
+    """
+    저장된 스코어로 성취 수준 컬럼만 다시 계산 (모델 호출 없음). 다른 컬럼은 원본과 공유.
+    """
+    tiered = scored.copy(deep=False)
+    if SCORE_COLUMN in tiered.columns:
+        tiered["성취 수준"] = assign_tiers(tiered[SCORE_COLUMN], cut_points)
+    if UNCERTAIN_COLUMN in tiered.columns:
+        tiered[UNCERTAIN_COLUMN] = uncertain_tiers(tiered[SPREAD_COLUMNS[1]], tiered[SPREAD_COLUMNS[2]], cut_points)
+    for column in tiered.columns:
+        if column.startswith("스코어 ("):
+            tiered[f"성취 수준 ({column[len('스코어 ('):-1]})"] = assign_tiers(tiered[column], cut_points)
+    return tiered
+
+# 개인별 분석/동료 그룹 비교에 쓰는 주요 열 정의
+target_columns = [
+    "동아리수", "자격증수", "토익수준", "수상빈도",
+    "전공체험_소요시간", "근로장학_근무시간", "일경험_근로시간",
+    "교수교류빈도", "선후배교류", "친구교류",
+    "창의융합", "문제해결", "의사소통", "리더십",
+    "학습지도", "전공기초", "전공전문성", "자기관리", "대인관계", "글로벌시민의식"
+]
+
+major_mapping = {
+    1: "기계공학부", 2: "메카트로닉스공학부", 3: "전기전자통신공학부",
+    4: "컴퓨터공학부", 5: "에너지신소재화학공학부", 6: "산업경영학부", 7: "디자인건축공학부"
+}
+
+def prepare_shared_data(data, models):
+    # 여러 모델이 쓰는 특성의 합집합으로 입력 행렬을 한 번만 구성 (없는 컬럼은 0)
+    features = list(dict.fromkeys(
+        col for model in models for col in getattr(model, "feature_names_in_", [])
+    ))
+    if not features:
+        return data
+    return data.reindex(columns=features, fill_value=0)
+
+def predict_models(models, shared_data, max_workers=None, with_spread=()):
+    # 공유 행렬에서 모델별 특성만 골라 동시에 예측 (특성 순서가 같으면 행렬을 그대로 사용)
+    # with_spread 에 있는 모델은 (확률, 트리 간 분산) 튜플을 반환
+    def predict(name, model):
+        features = list(getattr(model, "feature_names_in_", shared_data.columns))
+        model_input = shared_data if features == list(shared_data.columns) else shared_data[features]
+        if name in with_spread:
+            return predict_success_with_spread(model, model_input)
+        return predict_success(model, model_input)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(models)) as executor:
+        return dict(zip(models, executor.map(predict, models, models.values())))
+
+def score_data(data, model, comparison_models=None, cut_points=TIER_CUT_POINTS):
+    scored = data.copy()
+    models = {None: model, **(comparison_models or {})}
+    shared_data = prepare_shared_data(data, models.values())
+    all_probabilities = predict_models(models, shared_data, with_spread={None})
+    probabilities, spread = all_probabilities.pop(None)
+    scored['전공'] = scored['전공'].map(major_mapping)
+
+    if probabilities is not None:
+        scored[SCORE_COLUMN] = probabilities[:, SUCCESS_CLASS_INDEX]
+        scored["성취 수준"] = assign_tiers(probabilities[:, SUCCESS_CLASS_INDEX], cut_points)
+    # 기준 모델이 포레스트면 트리 간 스코어 분산과, 구간이 성취 수준 기준에 걸치는지 여부
+    if spread is not None:
+        for i, column in enumerate(SPREAD_COLUMNS):
+            scored[column] = spread[:, i]
+        scored[UNCERTAIN_COLUMN] = uncertain_tiers(spread[:, 1], spread[:, 2], cut_points)
+
+    # 비교 모델별 스코어/성취 수준 컬럼
+    for name, model_probabilities in all_probabilities.items():
+        if model_probabilities is not None:
+            scored[f"스코어 ({name})"] = model_probabilities[:, SUCCESS_CLASS_INDEX]
+            scored[f"성취 수준 ({name})"] = assign_tiers(model_probabilities[:, SUCCESS_CLASS_INDEX], cut_points)
+    return scored
@@ -0,0 +1,255 @@
+import hashlib
+import os
+import pickle
+import threading
+import uuid
+from collections import OrderedDict
+
+import streamlit as st
+
+from components.cache_paths import cache_dir
+
+# 세션 간에 공유하는 데이터셋 저장소 (내용 해시 기준, 용량 초과 시 LRU 로 디스크에 내림)
+DEFAULT_BYTE_BUDGET = int(float(os.environ.get("JOB_SUC_DATASET_BUDGET_MB", "512")) * 1024 * 1024)
+# 디스크로 내린 데이터셋 파일의 총 용량 한도 (넘으면 가장 오래 쓰지 않은 파일부터 삭제)
+DEFAULT_SPILL_BUDGET = int(float(os.environ.get("JOB_SUC_SPILL_BUDGET_MB", "2048")) * 1024 * 1024)
+
+# 데이터셋에서 파생한 결과(정렬 인덱스, 분포, 기준값 등)용 캐시 데코레이터:
+# 데이터셋 키 등 일반 인자로 구분해 프로세스 전체에서 한 번만 계산하고, _ 로 시작하는 인자(_data 등)는 해시하지 않음
+dataset_cache = st.cache_resource(max_entries=32)
+
+
+class DatasetStore:
+    """
+    내용 해시를 키로 DataFrame 을 한 번만 메모리에 두고, 세션은 키만 보관.
+    """
+
+    def __init__(self, byte_budget=DEFAULT_BYTE_BUDGET, spill_dir=None, spill_budget=DEFAULT_SPILL_BUDGET):
+        self.byte_budget = byte_budget
+        self.spill_budget = spill_budget
+        self.spill_dir = spill_dir or cache_dir("datasets")
+        self._entries = OrderedDict()  # key -> (data, nbytes), 가장 최근에 쓴 항목이 뒤쪽
+        self._spilling = {}  # 메모리에서 내렸지만 아직 디스크에 쓰는 중인 데이터셋
+        self._lock = threading.RLock()
+        self.used_bytes = 0
+        self.evictions = 0
+        self.reloads = 0
+        # 이전 실행에서 남은 파일도 한도 안으로 정리
+        self._prune_spills()
+
+    def _spill_path(self, key):
+        return self.spill_dir / f"{key}.pkl"
+
+    def put(self, data, key=None):
+        key = key or dataset_hash(data)
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return key
+            nbytes = int(data.memory_usage(deep=True).sum())
+            self._entries[key] = (data, nbytes)
+            self.used_bytes += nbytes
+            evicted = self._evict(keep=key)
+        # 디스크에 쓰는 동안 다른 세션의 get/put 을 막지 않도록 잠금 밖에서 기록
+        self._spill(evicted)
+        return key
+
+    def get(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key][0]
+            if key in self._spilling:
+                return self._spilling[key]
+
+        # 메모리에서 내려간 데이터셋은 디스크 캐시에서 다시 읽음
+        path = self._spill_path(key)
+        if not path.exists():
+            return None
+        try:
+            with open(path, "rb") as file:
+                data = pickle.load(file)
+            # 수정 시각을 사용 시각으로 갱신해 디스크 캐시 정리 시 최근에 쓴 파일을 남김
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        with self._lock:
+            self.reloads += 1
+        self.put(data, key)
+        return data
+
+    def get_or_put(self, key, load):
+        # 다른 세션이 같은 키로 이미 올린 데이터셋이면 load 없이 그대로 공유
+        data = self.get(key)
+        if data is None:
+            data = load()
+            self.put(data, key)
+        return data
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries or key in self._spilling or self._spill_path(key).exists()
+
+    def _evict(self, keep):
+        # 한도를 넘는 만큼 오래된 항목을 메모리에서 내리고, 디스크에 쓸 (키, 데이터) 목록을 반환 (잠금 안에서 호출)
+        evicted = []
+        while self.used_bytes > self.byte_budget and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            if key == keep:
+                break
+            data, nbytes = self._entries.pop(key)
+            self._spilling[key] = data
+            evicted.append((key, data))
+            self.used_bytes -= nbytes
+            self.evictions += 1
+        return evicted
+
+    def _spill(self, evicted):
+        for key, data in evicted:
+            path = self._spill_path(key)
+            try:
+                if not path.exists():
+                    temp_path = path.with_name(f"{key}.{uuid.uuid4().hex}.tmp")
+                    try:
+                        data.to_pickle(temp_path)
+                        os.replace(temp_path, path)
+                    finally:
+                        temp_path.unlink(missing_ok=True)
+            finally:
+                with self._lock:
+                    if self._spilling.get(key) is data:
+                        del self._spilling[key]
+            self._prune_spills(keep=key)
+
+    def _prune_spills(self, keep=None):
+        """
+        디스크로 내린 파일이 spill_budget 을 넘으면 가장 오래 쓰지 않은 파일부터 삭제 (방금 내린 keep 은 남김).
+        """
+        files = []
+        for path in self.spill_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in files)
+        for _, size, path in sorted(files, key=lambda file: file[0]):
+            if total <= self.spill_budget:
+                break
+            if path.stem == keep:
+                continue
+            path.unlink(missing_ok=True)
+            total -= size
+
+    def stats(self):
+        with self._lock:
+            return {
+                "datasets": len(self._entries),
+                "used_bytes": self.used_bytes,
+                "byte_budget": self.byte_budget,
+                "evictions": self.evictions,
+                "reloads": self.reloads,
+            }
+
+
+def dataset_hash(data):
+    import pandas as pd
+
+    digest = hashlib.sha256()
+    digest.update(repr(list(zip(data.columns, data.dtypes.astype(str)))).encode())
+    digest.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return digest.hexdigest()[:24]
+
+
+def bytes_hash(raw):
+    return hashlib.sha256(raw).hexdigest()[:24]
+
+
+def scoring_key(uploaded_data_key, model_hash, comparison_hashes):
+    # 같은 데이터/모델(비교 모델 포함) 조합이면 세션이 달라도 같은 스코어링 결과 키 (성취 수준은 기본 기준)
+    return bytes_hash("|".join(
+        [uploaded_data_key, model_hash]
+        + [f"{name}:{comparison_hash}" for name, comparison_hash in comparison_hashes.items()]
+    ).encode())
+
+
+def tiered_key(scored_key, cut_points):
+    # 기본 기준이면 스코어링 결과 그대로, 다른 기준이면 성취 수준만 다시 계산한 파생 데이터셋 키
+    from components.data_preparation import TIER_CUT_POINTS
+
+    cut_points = tuple(cut_points)
+    return scored_key if cut_points == tuple(TIER_CUT_POINTS) else bytes_hash(f"{scored_key}|tiers={cut_points}".encode())
+
+
+def tiered_dataset(scored_key, scored, cut_points):
+    """
+    스코어링 결과(기본 기준)에 cut_points 기준 성취 수준을 적용한 데이터셋과 그 키를 반환 (모델 호출 없음).
+    """
+    from components.data_preparation import apply_tiers
+
+    key = tiered_key(scored_key, cut_points)
+    if key == scored_key:
+        return key, scored
+    return key, get_dataset_store().get_or_put(key, lambda: apply_tiers(scored, cut_points))
+
+
+@st.cache_resource
+def get_dataset_store():
+    # 프로세스 전체(모든 세션)에서 하나의 저장소를 공유
+    return DatasetStore()
+
+
+def session_dataset(name):
+    """
+    세션이 참조하는 데이터셋(uploaded_data, processed_data 등)을 저장소에서 조회.
+    디스크 캐시 한도로 이미 삭제된 데이터셋이면 키를 지우고 만료 상태로 표시한 뒤 None.
+    """
+    key = st.session_state.get(f"{name}_key")
+    if key is None:
+        return None
+    data = get_dataset_store().get(key)
+    if data is None:
+        _mark_expired(name)
+    return data
+
+
+def dataset_expired(name):
+    """
+    세션이 참조하던 데이터셋이 메모리와 디스크 캐시 모두에서 삭제되었는지 여부 (데이터는 읽지 않음).
+    """
+    key = st.session_state.get(f"{name}_key")
+    if key is not None and key not in get_dataset_store():
+        _mark_expired(name)
+    return name in st.session_state.get("expired_datasets", ())
+
+
+def _mark_expired(name):
+    st.session_state.pop(f"{name}_key", None)
+    st.session_state.setdefault("expired_datasets", set()).add(name)
+
+
+def show_expired_warning():
+    """
+    불러온 데이터가 캐시에서 삭제되어 다시 불러와야 하면 안내하고 True 반환.
+    """
+    if not dataset_expired("uploaded_data"):
+        return False
+    st.warning("불러온 데이터가 오래되어 캐시에서 삭제되었습니다. '모델/데이터 불러오기' 페이지에서 다시 불러오세요.")
+    return True
+
+
+def set_session_dataset(name, data, key=None):
+    st.session_state[f"{name}_key"] = get_dataset_store().put(data, key)
+    st.session_state.get("expired_datasets", set()).discard(name)
+
+
+def clear_session_dataset(name):
+    st.session_state.pop(f"{name}_key", None)
+
+
+def show_store_status():
+    stats = get_dataset_store().stats()
+    st.caption(
+        f"공유 데이터 캐시: {stats['used_bytes'] / 1024 ** 2:.1f} / {stats['byte_budget'] / 1024 ** 2:.0f} MB "
+        f"(데이터셋 {stats['datasets']}개, 디스크로 내림 {stats['evictions']}회, 디스크에서 재로드 {stats['reloads']}회)"
+    )
@@ -0,0 +1,97 @@
+import io
+import os
+import shutil
+import tempfile
+
+import pandas as pd
+import xlsxwriter
+
+from components.cache_paths import cache_dir
+
+# 필터/정렬 결과 내보내기: 행 위치(positions) 순서대로 청크 단위로 써서 결과 전체 복사본을 만들지 않음
+CHUNK_SIZE = 5000
+EXPORTS_DIR_NAME = "exports"
+EXPORT_COLUMNS = ["학번", "이름", "학년", "재학학기", "전공", "취업 성공 가능 스코어 (%)", "성취 수준"]
+
+
+def export_columns(data, all_columns=False):
+    if all_columns:
+        return list(data.columns)
+    return [col for col in EXPORT_COLUMNS if col in data.columns]
+
+
+def iter_row_chunks(data, positions, columns, chunk_size=CHUNK_SIZE):
+    """
+    positions 순서대로 chunk_size 행씩 잘라서 반환.
+    """
+    for start in range(0, len(positions), chunk_size):
+        yield data.iloc[positions[start:start + chunk_size]][columns]
+
+
+def write_csv(data, positions, columns, file, chunk_size=CHUNK_SIZE):
+    # 엑셀에서 한글이 깨지지 않도록 BOM 포함 UTF-8 로 저장
+    text = io.TextIOWrapper(file, encoding="utf-8-sig", newline="")
+    header = True
+    for chunk in iter_row_chunks(data, positions, columns, chunk_size):
+        chunk.to_csv(text, header=header, index=False)
+        header = False
+    if header:
+        pd.DataFrame(columns=columns).to_csv(text, index=False)
+    text.flush()
+    text.detach()
+
+
+def write_xlsx(data, positions, columns, file, chunk_size=CHUNK_SIZE):
+    # constant_memory 모드는 행을 바로 임시 파일로 내보내므로 메모리 사용량이 행 수와 무관함
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "export.xlsx")
+        workbook = xlsxwriter.Workbook(path, {
+            "constant_memory": True, "tmpdir": temp_dir, "strings_to_urls": False, "strings_to_formulas": False,
+        })
+        sheet = workbook.add_worksheet("결과")
+        sheet.write_row(0, 0, columns)
+        row_index = 1
+        for chunk in iter_row_chunks(data, positions, columns, chunk_size):
+            chunk = chunk.astype(object).where(chunk.notna(), None)
+            for row in chunk.itertuples(index=False, name=None):
+                sheet.write_row(row_index, 0, row)
+                row_index += 1
+        workbook.close()
+        with open(path, "rb") as workbook_file:
+            shutil.copyfileobj(workbook_file, file)
+
+
+WRITERS = {"csv": write_csv, "xlsx": write_xlsx}
+MIME_TYPES = {
+    "csv": "text/csv",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+
+def export_rows(data, positions, columns, file_format, file, chunk_size=CHUNK_SIZE):
+    """
+    positions 순서의 행을 file(바이너리 파일 객체 또는 경로)에 CSV/XLSX 로 저장.
+    """
+    if isinstance(file, (str, bytes)) or hasattr(file, "__fspath__"):
+        with open(file, "wb") as output:
+            WRITERS[file_format](data, positions, columns, output, chunk_size)
+    else:
+        WRITERS[file_format](data, positions, columns, file, chunk_size)
+
+
+def export_file(data, positions, columns, file_format, chunk_size=CHUNK_SIZE):
+    """
+    캐시 폴더의 임시 파일에 청크 단위로 기록하고 처음 위치로 되돌린 파일 객체를 반환 (st.download_button 에 그대로 전달).
+    임시 파일은 파일 객체가 닫히면 삭제됨.
+    """
+    # st.download_button 이 읽을 수 있도록 버퍼 없는 파일(RawIOBase)을 반환하고, 쓰기만 버퍼를 거침
+    file = tempfile.TemporaryFile(dir=cache_dir(EXPORTS_DIR_NAME), suffix=f".{file_format}", buffering=0)
+    try:
+        output = io.BufferedWriter(file)
+        export_rows(data, positions, columns, file_format, output, chunk_size)
+        output.detach()
+    except BaseException:
+        file.close()
+        raise
+    file.seek(0)
+    return file
@@ -0,0 +1,259 @@
+import json
+import math
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from components.cache_paths import cache_dir
+from components.dataset_store import dataset_cache
+
+# 특성별 분포 요약(스케치): 청크/실행 단위로 합칠 수 있어 전체 데이터를 다시 읽지 않고 드리프트를 비교
+SKETCH_DIR_NAME = "feature_sketches"
+RELATIVE_ACCURACY = 0.01  # 분위수 상대 오차 1%
+ZERO_TOLERANCE = 1e-9
+CHUNK_SIZE = 100_000
+PSI_BINS = 10
+PSI_THRESHOLD = 0.2  # PSI 0.2 이상이면 분포가 크게 달라진 것으로 봄
+
+
+class FeatureSketch:
+    """
+    DDSketch 방식의 분위수 스케치. 값의 로그 구간별 개수(히스토그램)만 보관하므로
+    크기가 데이터 행 수와 무관하고, 같은 설정의 스케치끼리는 개수를 더해 합칠 수 있음.
+    """
+
+    def __init__(self, relative_accuracy=RELATIVE_ACCURACY):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.positive = {}  # 구간 인덱스 -> 개수
+        self.negative = {}
+        self.zero_count = 0
+        self.null_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _add_buckets(self, store, values):
+        indexes, counts = np.unique(np.ceil(np.log(values) / np.log(self.gamma)).astype(np.int64), return_counts=True)
+        for index, count in zip(indexes.tolist(), counts.tolist()):
+            store[index] = store.get(index, 0) + count
+
+    def update(self, values):
+        values = pd.to_numeric(pd.Series(values), errors="coerce").to_numpy(dtype=np.float64)
+        nulls = np.isnan(values)
+        self.null_count += int(nulls.sum())
+        values = values[~nulls]
+        if not len(values):
+            return self
+
+        self.count += len(values)
+        self.total += float(values.sum())
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        zeros = np.abs(values) <= ZERO_TOLERANCE
+        self.zero_count += int(zeros.sum())
+        self._add_buckets(self.positive, values[~zeros & (values > 0)])
+        self._add_buckets(self.negative, -values[~zeros & (values < 0)])
+        return self
+
+    def merge(self, other):
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("상대 오차 설정이 다른 스케치는 합칠 수 없습니다.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for index, count in other_store.items():
+                store[index] = store.get(index, 0) + count
+        self.zero_count += other.zero_count
+        self.null_count += other.null_count
+        self.count += other.count
+        self.total += other.total
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    def _bucket_values(self):
+        # 모든 구간의 대표값(오름차순)과 누적 개수
+        negative = sorted(self.negative, reverse=True)
+        positive = sorted(self.positive)
+        values = np.array(
+            [-self._bucket_value(index) for index in negative] + [0.0] + [self._bucket_value(index) for index in positive]
+        )
+        counts = np.array(
+            [self.negative[index] for index in negative] + [self.zero_count] + [self.positive[index] for index in positive]
+        )
+        return values, np.cumsum(counts)
+
+    def _bucket_value(self, index):
+        return 2 * self.gamma ** index / (self.gamma + 1)
+
+    def quantile(self, q):
+        if not self.count:
+            return math.nan
+        values, cumulative = self._bucket_values()
+        position = int(np.searchsorted(cumulative, q * (self.count - 1), side="right"))
+        return float(np.clip(values[min(position, len(values) - 1)], self.min, self.max))
+
+    def cdf(self, points):
+        """
+        points 이하인 값의 비율 (구간 대표값 기준).
+        """
+        if not self.count:
+            return np.zeros(len(points))
+        values, cumulative = self._bucket_values()
+        positions = np.searchsorted(values, points, side="right")
+        return np.where(positions > 0, cumulative[np.maximum(positions - 1, 0)], 0) / self.count
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else math.nan
+
+    def to_dict(self):
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "positive": {str(index): count for index, count in self.positive.items()},
+            "negative": {str(index): count for index, count in self.negative.items()},
+            "zero_count": self.zero_count,
+            "null_count": self.null_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        sketch = cls(state["relative_accuracy"])
+        sketch.positive = {int(index): count for index, count in state["positive"].items()}
+        sketch.negative = {int(index): count for index, count in state["negative"].items()}
+        for key in ("zero_count", "null_count", "count", "total"):
+            setattr(sketch, key, state[key])
+        sketch.min = math.inf if state["min"] is None else state["min"]
+        sketch.max = -math.inf if state["max"] is None else state["max"]
+        return sketch
+
+
+def sketch_features(model):
+    return list(getattr(model, "feature_names_in_", []))
+
+
+def build_sketches(chunks, features):
+    """
+    데이터 청크(DataFrame 반복자)를 한 번 훑으면서 특성별 스케치를 만들고 합침.
+    데이터에 없는 특성은 prepare_data 와 같이 0 으로 채운 것으로 봄.
+    """
+    sketches = {feature: FeatureSketch() for feature in features}
+    for chunk in chunks:
+        for feature in features:
+            values = chunk[feature] if feature in chunk.columns else np.zeros(len(chunk))
+            sketches[feature].update(values)
+    return sketches
+
+
+def iter_frame_chunks(data, chunk_size=CHUNK_SIZE):
+    for start in range(0, len(data), chunk_size):
+        yield data.iloc[start:start + chunk_size]
+
+
+def _sketch_path(run_id):
+    return cache_dir(SKETCH_DIR_NAME) / f"{run_id}.json"
+
+
+def save_sketches(run_id, sketches):
+    _sketch_path(run_id).write_text(
+        json.dumps({feature: sketch.to_dict() for feature, sketch in sketches.items()}, ensure_ascii=False),
+        encoding="utf-8",
+    )
+
+
+def load_sketches(run_id):
+    path = _sketch_path(run_id)
+    if not path.exists():
+        return None
+    state = json.loads(path.read_text(encoding="utf-8"))
+    return {feature: FeatureSketch.from_dict(sketch) for feature, sketch in state.items()}
+
+
+def has_sketches(run_id):
+    return _sketch_path(run_id).exists()
+
+
+def population_stability_index(reference, current, bins=PSI_BINS):
+    # 기준 분포의 분위수로 구간을 나누고 두 분포의 구간별 비율을 비교
+    edges = np.unique([reference.quantile(q) for q in np.linspace(0, 1, bins + 1)[1:-1]])
+    reference_ratio = np.diff(np.concatenate([[0.0], reference.cdf(edges), [1.0]]))
+    current_ratio = np.diff(np.concatenate([[0.0], current.cdf(edges), [1.0]]))
+    reference_ratio = np.clip(reference_ratio, 1e-4, None)
+    current_ratio = np.clip(current_ratio, 1e-4, None)
+    return float(np.sum((current_ratio - reference_ratio) * np.log(current_ratio / reference_ratio)))
+
+
+def drift_report(reference, current, threshold=PSI_THRESHOLD):
+    """
+    기준 실행과 현재 데이터의 특성별 PSI, 중앙값, 결측 비율 비교표.
+    """
+    rows = []
+    for feature, sketch in current.items():
+        if feature not in reference or not reference[feature].count or not sketch.count:
+            continue
+        base = reference[feature]
+        psi = population_stability_index(base, sketch)
+        rows.append({
+            "특성": feature,
+            "PSI": psi,
+            "기준 중앙값": base.quantile(0.5),
+            "현재 중앙값": sketch.quantile(0.5),
+            "기준 평균": base.mean,
+            "현재 평균": sketch.mean,
+            "기준 결측 비율": base.null_count / (base.count + base.null_count),
+            "현재 결측 비율": sketch.null_count / (sketch.count + sketch.null_count),
+            "드리프트": psi >= threshold,
+        })
+    report = pd.DataFrame(rows, columns=[
+        "특성", "PSI", "기준 중앙값", "현재 중앙값", "기준 평균", "현재 평균", "기준 결측 비율", "현재 결측 비율", "드리프트",
+    ])
+    return report.sort_values("PSI", ascending=False).reset_index(drop=True)
+
+
+@dataset_cache
+def get_dataset_sketches(dataset_key, model_hash, _data, _features):
+    # 데이터셋/모델 조합마다 한 번만 계산해 업로드 페이지와 스코어링 실행이 함께 사용
+    return build_sketches(iter_frame_chunks(_data), _features)
+
+
+def show_drift_check(data, model):
+    """
+    업로드한 데이터를 기준 실행의 스케치와 비교해 분포가 크게 달라진 특성을 표시.
+    """
+    from components.score_history import list_runs
+
+    features = sketch_features(model)
+    if not features:
+        return
+    if "model_hash" not in st.session_state:
+        from components.data_preparation import model_hash
+
+        st.session_state.model_hash = model_hash(model)
+    runs = [run for run in list_runs(st.session_state.model_hash) if has_sketches(run["run_id"])]
+    st.subheader("입력 데이터 분포 점검")
+    if not runs:
+        st.caption("같은 모델로 스코어링한 이전 실행이 없어 분포를 비교할 기준이 없습니다.")
+        return
+
+    run_ids = [run["run_id"] for run in runs]
+    col1, col2 = st.columns(2)
+    reference_run = col1.selectbox("기준 실행", run_ids, index=0)
+    threshold = col2.number_input("PSI 경고 기준", min_value=0.01, value=PSI_THRESHOLD, step=0.05)
+
+    current = get_dataset_sketches(st.session_state.uploaded_data_key, st.session_state.model_hash, data, features)
+    report = drift_report(load_sketches(reference_run), current, threshold)
+    drifted = report[report["드리프트"]]
+    if drifted.empty:
+        st.info(f"모든 특성의 분포가 기준 실행({reference_run})과 비슷합니다.")
+    else:
+        st.warning(
+            f"기준 실행({reference_run}) 대비 분포가 크게 달라진 특성 {len(drifted)}개: "
+            + ", ".join(drifted["특성"])
+        )
+    with st.expander("특성별 분포 비교"):
+        st.dataframe(report.round(3), use_container_width=True)
@@ -1,29 +1,117 @@
+from functools import partial
+
+import numpy as np
 import pandas as pd
 import streamlit as st
 from components.visualizations import create_colored_table, show_pie_chart
-from components.data_preparation import prepare_data, predict_success, categorize_performance
+from components.data_preparation import TIER_CUT_POINTS, UNCERTAIN_COLUMN, model_hash, score_data
+from components.dataset_store import (
+    get_dataset_store, scoring_key, session_dataset, set_session_dataset, show_expired_warning, tiered_dataset,
+)
+from components.feature_sketches import get_dataset_sketches, save_sketches, sketch_features
+from components.export import MIME_TYPES, export_columns, export_file
+from components.group_distributions import get_group_distributions
+from components.pagination import PAGE_SIZES, SORT_KEYS, get_sort_index, ordered_positions, page_slice
+from components.permutation_importance import start_permutation_importance
+from components.precompute import get_scheduler
+from components.snapshots import save_snapshot
+from components.score_history import append_run, tier_drops, tier_mix_by_major
 import plotly.express as px
 
+UNCERTAIN_TIER_OPTION = "불확실 (스코어 구간이 기준에 걸침)"
+
 
 def show_filters():
-    if "model" in st.session_state and "uploaded_data" in st.session_state:
+    uploaded_data = session_dataset("uploaded_data")
+    if "model" in st.session_state and uploaded_data is not None:
         model = st.session_state.model
-        data = st.session_state.uploaded_data.copy()
+        model_name = st.session_state.get("model_name")
+        comparison_models = {
+            name: other for name, other in st.session_state.get("models", {}).items() if name != model_name
+        }
+        if "model_hash" not in st.session_state:
+            st.session_state.model_hash = model_hash(model)
+
+        # 성취 수준 기준은 저장된 스코어를 다시 구간화할 뿐이므로 바꿔도 모델을 다시 호출하지 않음
+        cut_points = st.sidebar.slider(
+            "성취 수준 기준 스코어 (중성취 / 고성취 시작)", 0, 100,
+            value=tuple(st.session_state.get("tier_cut_points", TIER_CUT_POINTS)), key="tier_cut_points_input",
+        )
+        st.session_state.tier_cut_points = cut_points
 
         try:
-            prepared_data = prepare_data(data.copy(), model)
-            probabilities = predict_success(model, prepared_data)
-            major_mapping = {
-                1: "기계공학부", 2: "메카트로닉스공학부", 3: "전기전자통신공학부",
-                4: "컴퓨터공학부", 5: "에너지신소재화학공학부", 6: "산업경영학부", 7: "디자인건축공학부"
-            }
-            data['전공'] = data['전공'].map(major_mapping)
-
-            if probabilities is not None:
-                data["취업 성공 가능 스코어 (%)"] = probabilities[:, 1]
-                data["성취 수준"] = data["취업 성공 가능 스코어 (%)"].apply(categorize_performance)
-
-            st.session_state["processed_data"] = data
+            # 이미 스코어링된 결과가 있으면 DB 동기화로 변경된 학생만 다시 스코어링
+            store = get_dataset_store()
+            scored_key = st.session_state.get("scored_data_key")
+            scored = store.get(scored_key) if scored_key and session_dataset("processed_data") is not None else None
+            pending_ids = st.session_state.get("pending_score_ids")
+            scored_rows = None
+            if scored is None:
+                # 같은 데이터/모델 조합을 다른 세션이 이미 스코어링했다면 결과를 그대로 공유
+                model_hashes = st.session_state.get("model_hashes", {})
+                scored_key = scoring_key(
+                    st.session_state.uploaded_data_key, st.session_state.model_hash,
+                    {name: model_hashes.get(name) for name in comparison_models},
+                )
+                # 사전 계산에 스코어링 작업이 있으면 그 작업으로 처리 (대기 중이면 지금 실행, 실행 중이면 기다림)
+                scheduler = get_scheduler()
+                scheduler.run_now(("score", scored_key))
+                scored = store.get(scored_key)
+                if scored is None:
+                    scored = scored_rows = score_data(uploaded_data, model, comparison_models)
+                    store.put(scored, scored_key)
+                elif scheduler.claim_unrecorded(scored_key):
+                    # 백그라운드에서 스코어링한 결과는 처음 보는 세션이 이력/스냅샷으로 기록
+                    scored_rows = scored
+                st.session_state.scored_data_key = scored_key
+            elif pending_ids:
+                changed_rows = uploaded_data[uploaded_data["학번"].isin(pending_ids)]
+                changed_scored = score_data(changed_rows, model, comparison_models)
+                # 이력에는 변경되지 않은 학생의 기존 스코어와 합친 전체 결과를 기록해 직전 실행과 비교할 수 있게 함
+                scored = scored_rows = pd.concat(
+                    [scored[~scored["학번"].isin(pending_ids)], changed_scored], ignore_index=True
+                )
+                st.session_state.scored_data_key = store.put(scored)
+            st.session_state.pop("pending_score_ids", None)
+
+            # 성취 수준은 기본 기준 스코어링 결과에서 파생: 기준을 바꿔도 모델을 다시 호출하지 않고 성취 수준 컬럼만 다시 계산
+            processed_key, data = tiered_dataset(st.session_state.scored_data_key, scored, cut_points)
+            set_session_dataset("processed_data", data, processed_key)
+
+            # 그룹별 특성 분포와 정렬 순서를 미리 계산해 두어 이후에는 조회만 하도록 함
+            group_distributions = get_group_distributions(st.session_state.processed_data_key, data)
+            sort_index = get_sort_index(st.session_state.processed_data_key, data)
+
+            # 이번 실행에서 스코어링한 학생을 이력 저장소에 기록
+            if scored_rows is not None and "취업 성공 가능 스코어 (%)" in scored_rows.columns:
+                try:
+                    run_id = append_run(scored_rows, st.session_state.model_hash)
+                    # 이번 실행의 입력 분포 스케치를 함께 저장해 이후 업로드의 드리프트 비교 기준으로 사용
+                    save_sketches(run_id, get_dataset_sketches(
+                        st.session_state.uploaded_data_key, st.session_state.model_hash,
+                        uploaded_data, sketch_features(model),
+                    ))
+                except Exception as e:
+                    st.warning(f"스코어 이력을 저장하지 못했습니다: {e}")
+
+                # 업로드한 데이터 기준 순열 중요도는 페이지를 막지 않도록 백그라운드에서 계산
+                start_permutation_importance(
+                    model, uploaded_data, st.session_state.model_hash, st.session_state.uploaded_data_key
+                )
+
+                # 새로고침/재시작 후 다시 스코어링하지 않도록 결과와 인덱스, 모델 참조를 스냅샷으로 저장
+                try:
+                    models = st.session_state.get("models") or {model_name or "기준 모델": model}
+                    snapshot_model_name = model_name or next(iter(models))
+                    save_snapshot(
+                        st.session_state.scored_data_key, scored, processed_key,
+                        st.session_state.uploaded_data_key, uploaded_data,
+                        models, st.session_state.get("model_hashes") or {snapshot_model_name: st.session_state.model_hash},
+                        snapshot_model_name, cut_points, sort_index, group_distributions,
+                    )
+                except Exception as e:
+                    st.warning(f"스코어링 결과 스냅샷을 저장하지 못했습니다: {e}")
+
             st.markdown("""
     <style>
     .box-with-shadow {
@@ -48,9 +136,13 @@ def show_filters():
             st.subheader("필터 옵션")
             col1, col2, col3 = st.columns(3)
 
+            # 트리 간 스코어 구간이 있으면 구간이 성취 수준 기준에 걸친 학생만 따로 볼 수 있음
+            performance_options = ["전체", "고성취", "중성취", "저성취"]
+            if UNCERTAIN_COLUMN in data.columns:
+                performance_options.append(UNCERTAIN_TIER_OPTION)
             performance_filter = col1.selectbox(
                 "성취 수준:",
-                ["전체", "고성취", "중성취", "저성취"]
+                performance_options
             )
 
             grade_filter = col2.selectbox(
@@ -67,7 +159,7 @@ def show_filters():
 
             sort_by = col4.selectbox(
                 "정렬 기준:",
-                ["학번", "이름", "학년", "취업 성공 가능 스코어 (%)"]
+                SORT_KEYS
             )
             sort_order = col5.radio(
                 "정렬 순서:",
@@ -75,26 +167,55 @@ def show_filters():
             )
 
             def apply_filters(data, performance_filter, grade_filter, major_filter):
-                filtered_data = data.copy()
-                if performance_filter != "전체":
-                    filtered_data = filtered_data[filtered_data["성취 수준"] == performance_filter]
+                # 필터 결과는 불리언 마스크로만 보관 (데이터프레임 복사 없음)
+                mask = np.ones(len(data), dtype=bool)
+                if performance_filter == UNCERTAIN_TIER_OPTION:
+                    mask &= data[UNCERTAIN_COLUMN].to_numpy(dtype=bool)
+                elif performance_filter != "전체":
+                    mask &= (data["성취 수준"] == performance_filter).to_numpy()
                 if grade_filter != "전체":
-                    filtered_data = filtered_data[filtered_data["학년"] == grade_filter]
+                    mask &= (data["학년"] == grade_filter).to_numpy()
                 if major_filter != "전체":
-                    filtered_data = filtered_data[filtered_data["전공"] == major_filter]
-                return filtered_data
+                    mask &= (data["전공"] == major_filter).to_numpy()
+                return mask
 
-            filtered_data = apply_filters(data, performance_filter, grade_filter, major_filter)
+            mask = apply_filters(data, performance_filter, grade_filter, major_filter)
             ascending = True if sort_order == "오름차순" else False
-            filtered_data = filtered_data.sort_values(by=sort_by, ascending=ascending)
+            positions = ordered_positions(data, sort_index, sort_by, mask, ascending)
 
-            if not filtered_data.empty:
-                colored_table = create_colored_table(filtered_data)
+            if len(positions) > 0:
+                # 현재 페이지의 행만 테이블로 만들어 브라우저로 보냄
                 st.subheader("필터링 및 정렬된 결과")
+                page_col1, page_col2 = st.columns([1, 3])
+                page_size = page_col1.selectbox("페이지당 행 수:", PAGE_SIZES)
+                with page_col2:
+                    start, end = page_slice(len(positions), page_size)
+                colored_table = create_colored_table(data.iloc[positions[start:end]])
                 st.table(colored_table)
+                st.caption(f"총 {len(positions)}명 중 {start + 1}–{end}번째")
             else:
                 st.warning("선택된 조건에 해당하는 데이터가 없습니다.")
 
+            # 현재 필터/정렬 결과 또는 전체 학생을 CSV/XLSX 로 내보내기 (클릭 시에만 파일 생성)
+            with st.expander("결과 내보내기"):
+                include_all_columns = st.checkbox("모든 컬럼 포함")
+                columns = export_columns(data, include_all_columns)
+                all_positions = np.arange(len(data))
+                export_col1, export_col2, export_col3, export_col4 = st.columns(4)
+                for export_col, label, file_format, export_positions, file_name in [
+                    (export_col1, "현재 결과 CSV", "csv", positions, "filtered_results.csv"),
+                    (export_col2, "현재 결과 XLSX", "xlsx", positions, "filtered_results.xlsx"),
+                    (export_col3, "전체 학생 CSV", "csv", all_positions, "all_students.csv"),
+                    (export_col4, "전체 학생 XLSX", "xlsx", all_positions, "all_students.xlsx"),
+                ]:
+                    export_col.download_button(
+                        label,
+                        data=partial(export_file, data, export_positions, columns, file_format),
+                        file_name=file_name,
+                        mime=MIME_TYPES[file_format],
+                        disabled=len(export_positions) == 0,
+                    )
+
                         # 성취 수준별 비율, 학년별 비율, 전공별 비율을 가로 레이아웃으로 표시
             st.markdown("---")
             st.subheader("성취 수준, 학년별, 전공별 비율")
@@ -171,7 +292,60 @@ def show_filters():
             )
             st.plotly_chart(heatmap, use_container_width=True)
 
+            # 비교 모델이 있으면 기준 모델과의 성취 수준 불일치 확인
+            comparison_names = [name for name in comparison_models if f"성취 수준 ({name})" in data.columns]
+            if comparison_names:
+                st.markdown("---")
+                st.markdown("#### 모델 간 스코어 비교")
+                compare_name = st.selectbox("비교할 모델:", comparison_names)
+                compare_score, compare_tier = f"스코어 ({compare_name})", f"성취 수준 ({compare_name})"
+                tier_mismatch = data["성취 수준"] != data[compare_tier]
+
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.metric("성취 수준 일치율", f"{(~tier_mismatch).mean() * 100:.1f}%")
+                    st.table(pd.crosstab(
+                        data["성취 수준"], data[compare_tier],
+                        rownames=[f"기준: {model_name}"], colnames=[compare_name],
+                    ))
+                with col2:
+                    compare_chart = px.scatter(
+                        data, x="취업 성공 가능 스코어 (%)", y=compare_score, color="성취 수준",
+                        hover_data=["학번", "이름"], title="모델별 스코어 비교",
+                        color_discrete_map={"고성취": "green", "중성취": "yellow", "저성취": "red"}
+                    )
+                    st.plotly_chart(compare_chart, use_container_width=True)
+
+                disagreements = data.loc[tier_mismatch, [
+                    "학번", "이름", "전공", "학년", "취업 성공 가능 스코어 (%)", "성취 수준", compare_score, compare_tier
+                ]]
+                disagreements["스코어 차이"] = (disagreements[compare_score] - disagreements["취업 성공 가능 스코어 (%)"]).abs()
+                st.markdown(f"##### 성취 수준이 다르게 예측된 학생 ({len(disagreements)}명)")
+                st.dataframe(disagreements.sort_values("스코어 차이", ascending=False), use_container_width=True)
+
+            st.markdown("---")
+            if st.toggle("스코어 이력 보기"):
+                history_hash = st.session_state.get("model_hash")
+                st.markdown("#### 직전 실행 대비 성취 수준이 낮아진 학생")
+                dropped = tier_drops(history_hash)
+                if dropped.empty:
+                    st.info("성취 수준이 낮아진 학생이 없거나 비교할 이전 실행이 없습니다.")
+                else:
+                    st.dataframe(dropped, use_container_width=True)
+
+                st.markdown("#### 전공별 성취 수준 구성 추이")
+                history_tier = st.selectbox("추이를 확인할 성취 수준:", ["고성취", "중성취", "저성취"])
+                tier_mix = tier_mix_by_major(history_hash)
+                tier_mix = tier_mix[tier_mix["성취 수준"] == history_tier]
+                if not tier_mix.empty:
+                    mix_chart = px.line(
+                        tier_mix, x="run_at", y="ratio", color="전공", markers=True,
+                        labels={"run_at": "실행 시각", "ratio": f"{history_tier} 비율"},
+                        title=f"전공별 {history_tier} 비율 추이",
+                    )
+                    st.plotly_chart(mix_chart, use_container_width=True)
+
         except Exception as e:
             st.error(f"결과를 처리하는 중 오류가 발생했습니다: {e}")
-    else:
+    elif not show_expired_warning():
         st.warning("먼저 '모델/데이터 불러오기' 페이지에서 데이터를 업로드하세요.")
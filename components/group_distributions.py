@@ -0,0 +1,62 @@
+import numpy as np
+import pandas as pd
+
+from components.dataset_store import dataset_cache
+
+# 그룹별 특성 분포: 스코어링 직후 한 번만 계산해 두고 특성 전환 시 조회만 함
+EXCLUDED_COLUMNS = ["학번", "이름", "성취 수준", "취업 성공 가능 스코어 (%)"]
+CATEGORICAL_MAX_VALUES = 20  # 고유값이 이보다 많은 수치형 특성은 구간으로 나눔
+N_BINS = 10
+
+
+def distribution_features(data):
+    return [
+        col for col in data.columns
+        if col not in EXCLUDED_COLUMNS and not col.startswith(("스코어 (", "성취 수준 ("))
+    ]
+
+
+def feature_distribution(tier_codes, tier_labels, column, bins=N_BINS):
+    """
+    성취 수준별 특성 값의 비율표 (행: 성취 수준, 열: 값 또는 구간).
+    범주형은 값별로 정확히 세고, 연속형은 고정된 구간으로 나눔.
+    """
+    valid = column.notna().to_numpy() & (tier_codes >= 0)
+    if pd.api.types.is_numeric_dtype(column) and column.nunique() > CATEGORICAL_MAX_VALUES:
+        values = column.to_numpy(dtype=float)
+        edges = np.histogram_bin_edges(values[valid], bins=bins)
+        value_codes = np.clip(np.searchsorted(edges, values, side="right") - 1, 0, bins - 1)
+        value_labels = [f"{edges[i]:g}~{edges[i + 1]:g}" for i in range(bins)]
+    else:
+        value_codes, value_labels = pd.factorize(column, sort=True)
+
+    # (성취 수준, 값) 쌍을 한 번의 bincount 로 집계
+    n_values = len(value_labels)
+    counts = np.bincount(
+        tier_codes[valid] * n_values + value_codes[valid], minlength=len(tier_labels) * n_values
+    ).reshape(len(tier_labels), n_values)
+    totals = counts.sum(axis=1, keepdims=True)
+    ratios = np.divide(counts, totals, out=np.zeros(counts.shape), where=totals > 0)
+    return pd.DataFrame(
+        ratios.astype(np.float32),
+        index=pd.Index(tier_labels, name="성취 수준"),
+        columns=pd.Index(value_labels, name=column.name),
+    )
+
+
+def compute_group_distributions(data, bins=N_BINS):
+    if "성취 수준" not in data.columns:
+        return {}
+    tier_codes, tier_labels = pd.factorize(data["성취 수준"], sort=True)
+    return {
+        feature: feature_distribution(tier_codes, list(tier_labels), data[feature], bins)
+        for feature in distribution_features(data)
+    }
+
+
+@dataset_cache
+def get_group_distributions(dataset_key, _data):
+    from components.snapshots import load_group_distributions
+
+    group_distributions = load_group_distributions(dataset_key)
+    return group_distributions if group_distributions is not None else compute_group_distributions(_data)
@@ -0,0 +1,51 @@
+import numpy as np
+import streamlit as st
+
+from components.dataset_store import dataset_cache
+
+# 정렬 기준별 행 순서(argsort)를 데이터셋마다 한 번만 계산해 두고 페이지 단위로 잘라서 표시
+SORT_KEYS = ["학번", "이름", "학년", "취업 성공 가능 스코어 (%)"]
+PAGE_SIZES = [25, 50, 100, 200]
+
+
+def build_sort_index(data, keys=SORT_KEYS):
+    """
+    정렬 기준별 오름차순 행 위치 배열 (결측값은 맨 뒤).
+    """
+    return {
+        key: data[key].reset_index(drop=True).sort_values(kind="stable").index.to_numpy()
+        for key in keys if key in data.columns
+    }
+
+
+@dataset_cache
+def get_sort_index(dataset_key, _data):
+    # 복원한 스냅샷에 저장된 인덱스가 있으면 다시 정렬하지 않음
+    from components.snapshots import load_sort_index
+
+    sort_index = load_sort_index(dataset_key)
+    return sort_index if sort_index is not None else build_sort_index(_data)
+
+
+def ordered_positions(data, sort_index, sort_by, mask, ascending=True):
+    """
+    미리 정렬된 순서에서 필터에 해당하는 행만 남김. 내림차순은 값이 있는 앞부분만 뒤집어 결측값은 계속 맨 뒤.
+    """
+    permutation = sort_index[sort_by]
+    positions = permutation[mask[permutation]]
+    if ascending:
+        return positions
+    n_valid = len(positions) - int(data[sort_by].isna().to_numpy()[positions].sum())
+    return np.concatenate([positions[:n_valid][::-1], positions[n_valid:]])
+
+
+def page_slice(total, page_size, key="result_page"):
+    """
+    페이지 선택 위젯을 그리고 현재 페이지의 (시작, 끝) 위치를 반환.
+    """
+    n_pages = max(1, -(-total // page_size))
+    if st.session_state.get(key, 1) > n_pages:
+        st.session_state[key] = 1
+    page = st.number_input(f"페이지 (총 {n_pages}쪽)", min_value=1, max_value=n_pages, step=1, key=key)
+    start = (page - 1) * page_size
+    return start, min(start + page_size, total)
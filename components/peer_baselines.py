@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from components.data_preparation import HIGH_TIER
+from components.dataset_store import dataset_cache
+
+# (전공, 학년) 동료 그룹별 기준값: 데이터셋마다 한 번만 계산해 두고 개인별 분석에서는 조회만 함
+GROUP_COLUMNS = ["전공", "학년"]
+QUANTILES = [0.25, 0.5, 0.75]
+STATISTICS = ["평균"] + [f"{int(q * 100)}% 분위" for q in QUANTILES] + [f"{HIGH_TIER} 평균"]
+COHORT_GROUP = ("전체", "전체")
+
+
+class PeerBaselines:
+    """
+    그룹별 통계를 (그룹 수 x 통계 수 x 특성 수) float32 배열 하나에 담고, (전공, 학년) -> 행 위치 사전으로 조회.
+    """
+
+    def __init__(self, groups, values, columns, sizes):
+        self.columns = list(columns)
+        self.values = values
+        self.sizes = sizes
+        self._groups = pd.MultiIndex.from_tuples(groups, names=GROUP_COLUMNS)
+        self._positions = {group: position for position, group in enumerate(groups)}
+
+    def __contains__(self, group):
+        return group in self._positions
+
+    def lookup(self, major, grade):
+        """
+        동료 그룹의 기준값 (행: 통계, 열: 특성). 그룹이 없으면 전체 학생 기준.
+        """
+        position = self._positions.get((major, grade), self._positions[COHORT_GROUP])
+        return pd.DataFrame(self.values[position], index=STATISTICS, columns=self.columns)
+
+    def row_statistic(self, data, statistic="평균"):
+        """
+        data 의 행마다 해당 동료 그룹의 통계값 (행 수 x 특성 수). 그룹이 없는 행은 전체 학생 기준.
+        """
+        positions = self._groups.get_indexer(pd.MultiIndex.from_frame(data[GROUP_COLUMNS]))
+        positions[positions < 0] = self._positions[COHORT_GROUP]
+        return self.values[positions, STATISTICS.index(statistic)]
+
+    def group_size(self, major, grade):
+        return int(self.sizes[self._positions.get((major, grade), self._positions[COHORT_GROUP])])
+
+
+def _group_statistics(data, columns, keys):
+    # 그룹별 평균/분위수/고성취 평균을 (그룹, 통계, 특성) 배열로 계산
+    grouped = data.groupby(keys, observed=True, sort=False)[columns]
+    means = grouped.mean()
+    quantiles = grouped.quantile(QUANTILES)
+    high_tier = (data["성취 수준"] == HIGH_TIER).to_numpy()
+    high_keys = [key[high_tier] if isinstance(key, np.ndarray) else key for key in keys]
+    high = data[high_tier].groupby(high_keys, observed=True)[columns].mean().reindex(means.index)
+    values = np.stack(
+        [means.to_numpy()]
+        + [quantiles.xs(q, level=-1).reindex(means.index).to_numpy() for q in QUANTILES]
+        + [high.to_numpy()],
+        axis=1,
+    )
+    return list(means.index), values, grouped.size().reindex(means.index).to_numpy()
+
+
+def compute_peer_baselines(data, columns):
+    """
+    (전공, 학년) 그룹과 전체 학생의 기준값 표. 그룹에 고성취 학생이 없으면 전체 고성취 평균으로 채움.
+    """
+    columns = [col for col in columns if col in data.columns]
+    numeric = data[GROUP_COLUMNS + ["성취 수준"]].join(data[columns].apply(pd.to_numeric, errors="coerce"))
+
+    groups, values, sizes = _group_statistics(numeric, columns, GROUP_COLUMNS)
+    _, cohort_values, cohort_sizes = _group_statistics(numeric, columns, [np.zeros(len(numeric), dtype=np.int8)])
+
+    high = values[:, -1, :]
+    values[:, -1, :] = np.where(np.isnan(high), cohort_values[0, -1, :], high)
+    return PeerBaselines(
+        groups + [COHORT_GROUP],
+        np.concatenate([values, cohort_values]).astype(np.float32),
+        columns,
+        np.concatenate([sizes, cohort_sizes]),
+    )
+
+
+@dataset_cache
+def get_peer_baselines(dataset_key, _data, columns):
+    return compute_peer_baselines(_data, list(columns))
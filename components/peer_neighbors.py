@@ -0,0 +1,64 @@
+import numpy as np
+import pandas as pd
+from sklearn.neighbors import KDTree
+
+from components.data_preparation import HIGH_TIER
+from components.dataset_store import dataset_cache
+
+# 고성취 학생 대상 KD-트리: 스코어링 결과마다 한 번만 만들고, 개인별 분석에서 비슷한 고성취 학생을 바로 조회
+LEVEL_COLUMNS = ["성적수준", "교류수준", "역량수준", "일경험수준", "비교과수준"]
+
+
+class NeighborIndex:
+    """
+    전체 학생 기준으로 표준화한 특성 공간에서 고성취 학생만 담은 KD-트리 (전체 + 전공별).
+    """
+
+    def __init__(self, data, columns):
+        self.columns = [col for col in columns if col in data.columns]
+        values = data[self.columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+        self.mean = np.nanmean(values, axis=0)
+        std = np.nanstd(values, axis=0)
+        self.std = np.where(std > 0, std, 1.0)
+        standardized = np.nan_to_num((values - self.mean) / self.std)
+
+        high_positions = np.flatnonzero((data["성취 수준"] == HIGH_TIER).to_numpy())
+        majors = data["전공"].to_numpy()[high_positions]
+        # 트리 행 번호 -> 원본 데이터 행 위치
+        self.positions = {None: high_positions}
+        self.trees = {None: KDTree(standardized[high_positions])} if len(high_positions) else {}
+        for major in pd.unique(majors):
+            major_positions = high_positions[majors == major]
+            self.positions[major] = major_positions
+            self.trees[major] = KDTree(standardized[major_positions])
+        self.standardized = standardized
+
+    def query(self, position, k=5, major=None):
+        """
+        position 행 학생과 가장 가까운 고성취 학생 k명의 (행 위치, 거리). 본인은 제외.
+        """
+        tree = self.trees.get(major)
+        if tree is None:
+            return np.array([], dtype=np.int64), np.array([])
+        n_query = min(k + 1, tree.data.shape[0])
+        distances, rows = tree.query(self.standardized[position:position + 1], k=n_query)
+        positions = self.positions[major][rows[0]]
+        keep = positions != position
+        return positions[keep][:k], distances[0][keep][:k]
+
+    def differences(self, position, neighbor_positions):
+        """
+        비슷한 고성취 학생들의 평균과 학생 값의 차이 (표준편차 단위, 차이가 큰 순).
+        """
+        gap = self.standardized[neighbor_positions].mean(axis=0) - self.standardized[position]
+        return pd.DataFrame({
+            "특성": self.columns,
+            "차이 (표준편차)": gap,
+            "학생 값": self.standardized[position] * self.std + self.mean,
+            "비슷한 고성취 평균": self.standardized[neighbor_positions].mean(axis=0) * self.std + self.mean,
+        }).sort_values("차이 (표준편차)", key=np.abs, ascending=False).reset_index(drop=True)
+
+
+@dataset_cache
+def get_neighbor_index(dataset_key, _data, columns):
+    return NeighborIndex(_data, list(columns))
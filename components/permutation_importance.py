@@ -0,0 +1,149 @@
+import json
+import threading
+import warnings
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from components.cache_paths import cache_dir
+from components.data_preparation import SUCCESS_CLASS_INDEX, prepare_data
+from components.process_pool import default_workers, spawn_executor
+
+# 업로드한 학생 데이터 기준 순열 중요도. 라벨이 없으므로 특성을 섞었을 때 예측 스코어가 얼마나 바뀌는지로 측정
+IMPORTANCE_DIR_NAME = "permutation_importance"
+MAX_ROWS = 20_000  # 큰 데이터는 표본으로 계산 (고정 시드)
+N_REPEATS = 3
+
+_worker_model = None
+_worker_matrix = None
+_worker_base_scores = None
+
+
+def _init_worker(model, matrix_path):
+    # 작업 프로세스마다 모델을 한 번만 받고, 입력 행렬은 메모리 맵으로 모든 프로세스가 공유 (읽기 전용)
+    global _worker_model, _worker_matrix, _worker_base_scores
+    # 특성 이름 없이 행렬로 예측하므로 sklearn 의 feature name 경고는 끔
+    warnings.filterwarnings("ignore", message="X does not have valid feature names")
+    _worker_model = model
+    _worker_matrix = np.load(matrix_path, mmap_mode="r")
+    _worker_base_scores = _success_scores(_worker_matrix)
+
+
+def _success_scores(matrix):
+    return _worker_model.predict_proba(matrix)[:, SUCCESS_CLASS_INDEX] * 100
+
+
+def _feature_importance(feature_index, n_repeats, seed):
+    """
+    특성 하나를 n_repeats 번 섞어 예측 스코어의 평균 절대 변화량(%p)을 계산.
+    """
+    permuted = np.array(_worker_matrix)
+    rng = np.random.default_rng(seed + feature_index)
+    changes = []
+    for _ in range(n_repeats):
+        permuted[:, feature_index] = rng.permutation(_worker_matrix[:, feature_index])
+        changes.append(np.abs(_success_scores(permuted) - _worker_base_scores).mean())
+    return feature_index, float(np.mean(changes)), float(np.std(changes))
+
+
+def _result_path(model_hash, dataset_key):
+    return cache_dir(IMPORTANCE_DIR_NAME) / f"{model_hash}-{dataset_key}.json"
+
+
+def compute_permutation_importance(model, data, model_hash, dataset_key, max_workers=None,
+                                   n_repeats=N_REPEATS, max_rows=MAX_ROWS, seed=0):
+    """
+    특성마다 작업 하나씩 프로세스 풀에 나눠 순열 중요도를 계산하고 결과 파일로 저장.
+    """
+    if len(data) > max_rows:
+        data = data.sample(max_rows, random_state=seed)
+    prepared = prepare_data(data.copy(), model)
+    features = list(prepared.columns)
+
+    matrix_path = cache_dir(IMPORTANCE_DIR_NAME) / f"{model_hash}-{dataset_key}.npy"
+    np.save(matrix_path, prepared.to_numpy(dtype=np.float32))
+    try:
+        with spawn_executor(
+            max_workers or default_workers(len(features)), _init_worker, (model, str(matrix_path))
+        ) as executor:
+            results = list(executor.map(
+                _feature_importance, range(len(features)), [n_repeats] * len(features), [seed] * len(features)
+            ))
+    finally:
+        matrix_path.unlink(missing_ok=True)
+
+    importance = pd.DataFrame(
+        [(features[index], mean, std) for index, mean, std in results],
+        columns=["특성", "중요도", "표준편차"],
+    ).sort_values("중요도", ascending=False).reset_index(drop=True)
+    _result_path(model_hash, dataset_key).write_text(
+        importance.to_json(orient="records", force_ascii=False), encoding="utf-8"
+    )
+    return importance
+
+
+def load_permutation_importance(model_hash, dataset_key):
+    path = _result_path(model_hash, dataset_key)
+    if not path.exists():
+        return None
+    return pd.DataFrame(json.loads(path.read_text(encoding="utf-8")), columns=["특성", "중요도", "표준편차"])
+
+
+@st.cache_resource
+def _running_jobs():
+    # (모델 해시, 데이터셋 키) -> 계산이 끝나면 설정되는 이벤트. 여러 세션이 같은 조합을 요청해도 한 번만 계산
+    # (계산하는 스레드가 사전 계산 작업자처럼 계속 도는 스레드일 수 있으므로 스레드가 아니라 이벤트를 기다림)
+    return {}, threading.Lock()
+
+
+def run_permutation_importance(model, data, model_hash, dataset_key):
+    """
+    결과가 없으면 계산. 다른 스레드가 같은 조합을 계산 중이면 끝날 때까지 기다림.
+    """
+    if _result_path(model_hash, dataset_key).exists():
+        return
+    jobs, lock = _running_jobs()
+    key = (model_hash, dataset_key)
+    with lock:
+        running = jobs.get(key)
+        if running is None:
+            jobs[key] = done = threading.Event()
+    if running is not None:
+        running.wait()
+        return
+    try:
+        compute_permutation_importance(model, data, model_hash, dataset_key)
+    finally:
+        with lock:
+            jobs.pop(key, None)
+        done.set()
+
+
+def start_permutation_importance(model, data, model_hash, dataset_key):
+    """
+    결과가 없고 계산 중도 아니면 백그라운드 스레드에서 계산을 시작.
+    """
+    if _result_path(model_hash, dataset_key).exists():
+        return
+    jobs, lock = _running_jobs()
+    with lock:
+        if (model_hash, dataset_key) in jobs:
+            return
+    threading.Thread(
+        target=run_permutation_importance, args=(model, data, model_hash, dataset_key),
+        name=f"permutation-importance-{dataset_key}", daemon=True,
+    ).start()
+
+
+def permutation_importance_status(model_hash, dataset_key):
+    """
+    ("done", 결과) / ("running", None) / ("missing", None)
+    """
+    importance = load_permutation_importance(model_hash, dataset_key)
+    if importance is not None:
+        return "done", importance
+    jobs, lock = _running_jobs()
+    with lock:
+        running = (model_hash, dataset_key) in jobs
+    return ("running" if running else "missing"), None
@@ -0,0 +1,226 @@
+import itertools
+import queue
+import threading
+import uuid
+
+import streamlit as st
+
+# 업로드 직후 시작하는 백그라운드 사전 계산: 스코어링 -> 차트 집계 -> 학생별 분석 순서로 캐시를 미리 채움
+PRIORITY_SCORING = 0
+PRIORITY_AGGREGATES = 1
+PRIORITY_STUDENT = 2
+MAX_FINISHED_JOBS = 256
+
+
+class PrecomputeJob:
+    def __init__(self, key, priority, label, run):
+        self.key = key
+        self.priority = priority
+        self.label = label
+        self.run = run
+        self.owners = set()
+        self.state = "queued"
+        self.error = None
+        self.finished = threading.Event()
+
+
+class PrecomputeScheduler:
+    """
+    우선순위 큐 하나와 작업 스레드 하나로 사전 계산 작업을 실행.
+    같은 키의 작업은 여러 세션이 함께 소유하고(중복 제거), 소유 세션이 모두 취소하면 실행하지 않음.
+    """
+
+    def __init__(self):
+        self._jobs = {}
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self._unrecorded = set()
+        self._worker = threading.Thread(target=self._run, name="precompute", daemon=True)
+        self._worker.start()
+
+    def submit(self, key, priority, label, run, owner):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.state in ("failed", "cancelled"):
+                job = PrecomputeJob(key, priority, label, run)
+                self._jobs[key] = job
+                self._queue.put((priority, next(self._sequence), key))
+            job.owners.add(owner)
+            return job
+
+    def cancel_owner(self, owner, keep=()):
+        """
+        owner 세션의 작업 중 keep 에 없는 것을 포기. 다른 세션도 쓰지 않는 대기 작업은 취소됨.
+        """
+        with self._lock:
+            for key, job in self._jobs.items():
+                if owner in job.owners and key not in keep:
+                    job.owners.discard(owner)
+                    if not job.owners and job.state == "queued":
+                        job.state = "cancelled"
+                        job.finished.set()
+
+    def run_now(self, key):
+        """
+        페이지가 결과를 바로 필요로 할 때: 대기 중인 작업은 호출한 스레드에서 즉시 실행하고,
+        실행 중인 작업은 끝날 때까지 기다림 (같은 계산을 두 번 하지 않도록).
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None:
+                return None
+            claimed = job.state == "queued"
+            if claimed:
+                job.state = "running"
+        if claimed:
+            self._execute(job)
+        else:
+            job.finished.wait()
+        return job
+
+    def mark_unrecorded(self, scoring_key):
+        with self._lock:
+            self._unrecorded.add(scoring_key)
+
+    def claim_unrecorded(self, scoring_key):
+        """
+        백그라운드에서 스코어링한 결과를 처음 보는 세션이 이력/스냅샷 기록을 맡도록 한 번만 True 를 반환.
+        """
+        with self._lock:
+            if scoring_key in self._unrecorded:
+                self._unrecorded.discard(scoring_key)
+                return True
+            return False
+
+    def status(self, owner):
+        with self._lock:
+            return [(job.label, job.state) for job in self._jobs.values() if owner in job.owners]
+
+    def _run(self):
+        while True:
+            _, _, key = self._queue.get()
+            with self._lock:
+                job = self._jobs.get(key)
+                if job is None or job.state != "queued":
+                    continue
+                job.state = "running"
+            self._execute(job)
+
+    def _execute(self, job):
+        try:
+            job.run()
+            state = "done"
+        except Exception as e:
+            job.error = e
+            state = "failed"
+        with self._lock:
+            job.state = state
+            self._prune()
+        job.finished.set()
+
+    def _prune(self):
+        finished = [key for key, job in self._jobs.items() if job.state in ("done", "failed", "cancelled")]
+        for key in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[key]
+
+
+@st.cache_resource
+def get_scheduler():
+    # 프로세스 전체(모든 세션)에서 하나의 스케줄러를 공유
+    return PrecomputeScheduler()
+
+
+def session_owner():
+    if "precompute_owner" not in st.session_state:
+        st.session_state.precompute_owner = uuid.uuid4().hex
+    return st.session_state.precompute_owner
+
+
+def start_precompute():
+    """
+    현재 세션의 모델/데이터로 사전 계산 작업을 등록하고, 이전 데이터셋의 작업은 포기.
+    """
+    from components.data_preparation import TIER_CUT_POINTS, score_data, target_columns
+    from components.dataset_store import get_dataset_store, scoring_key, session_dataset, tiered_dataset, tiered_key
+    from components.feature_sketches import get_dataset_sketches, sketch_features
+    from components.group_distributions import get_group_distributions
+    from components.pagination import get_sort_index
+    from components.peer_baselines import get_peer_baselines
+    from components.peer_neighbors import LEVEL_COLUMNS, get_neighbor_index
+    from components.permutation_importance import run_permutation_importance
+
+    uploaded_data = session_dataset("uploaded_data")
+    if "model" not in st.session_state or uploaded_data is None:
+        return
+    model = st.session_state.model
+    model_hash = st.session_state.model_hash
+    model_name = st.session_state.get("model_name")
+    models = st.session_state.get("models", {})
+    comparison_models = {name: other for name, other in models.items() if name != model_name}
+    model_hashes = st.session_state.get("model_hashes", {})
+    cut_points = tuple(st.session_state.get("tier_cut_points", TIER_CUT_POINTS))
+    uploaded_key = st.session_state.uploaded_data_key
+    store = get_dataset_store()
+    scheduler = get_scheduler()
+    owner = session_owner()
+    if st.session_state.get("pending_score_ids"):
+        # DB 변경분 동기화 직후에는 페이지가 변경된 학생만 다시 스코어링하므로 전체 스코어링/집계를 미리 하지 않음
+        scheduler.cancel_owner(owner)
+        return
+    # 이미 스코어링한 결과(변경분 병합 결과 포함)가 있으면 그 데이터셋 기준으로 집계만 미리 계산
+    already_scored = session_dataset("processed_data") is not None and "scored_data_key" in st.session_state
+    if already_scored:
+        scored_key = st.session_state.scored_data_key
+    else:
+        scored_key = scoring_key(uploaded_key, model_hash, {name: model_hashes.get(name) for name in comparison_models})
+    # 집계는 세션의 성취 수준 기준을 적용한 데이터셋 기준 (기본 기준이면 스코어링 결과와 같은 키)
+    processed_key = tiered_key(scored_key, cut_points)
+
+    def score():
+        if store.get(scored_key) is None:
+            store.put(score_data(uploaded_data, model, comparison_models), scored_key)
+            scheduler.mark_unrecorded(scored_key)
+
+    def scored(build):
+        # 스코어링 결과가 있어야 하는 작업 (스코어링이 취소/실패했으면 건너뜀)
+        def run():
+            data = store.get(scored_key)
+            if data is not None:
+                build(tiered_dataset(scored_key, data, cut_points)[1])
+        return run
+
+    jobs = [] if already_scored else [(("score", scored_key), PRIORITY_SCORING, "스코어링", score)]
+    jobs += [
+        (("group_distributions", processed_key), PRIORITY_AGGREGATES, "그룹별 특성 분포",
+         scored(lambda data: get_group_distributions(processed_key, data))),
+        (("sort_index", processed_key), PRIORITY_AGGREGATES, "정렬 인덱스",
+         scored(lambda data: get_sort_index(processed_key, data))),
+        (("sketches", uploaded_key, model_hash), PRIORITY_AGGREGATES, "입력 분포 스케치",
+         lambda: get_dataset_sketches(uploaded_key, model_hash, uploaded_data, sketch_features(model))),
+        (("peer_baselines", processed_key), PRIORITY_STUDENT, "동료 그룹 기준값",
+         scored(lambda data: get_peer_baselines(processed_key, data, tuple(target_columns)))),
+        (("neighbors", processed_key), PRIORITY_STUDENT, "비슷한 고성취 학생 인덱스",
+         scored(lambda data: [
+             get_neighbor_index(processed_key, data, tuple(columns)) for columns in (target_columns, LEVEL_COLUMNS)
+         ])),
+        (("permutation_importance", model_hash, uploaded_key), PRIORITY_STUDENT, "특성 중요도",
+         lambda: run_permutation_importance(model, uploaded_data, model_hash, uploaded_key)),
+    ]
+    scheduler.cancel_owner(owner, keep={key for key, _, _, _ in jobs})
+    for key, priority, label, run in jobs:
+        scheduler.submit(key, priority, label, run, owner)
+
+
+def show_precompute_status():
+    statuses = get_scheduler().status(session_owner())
+    if not statuses:
+        return
+    pending = [label for label, state in statuses if state in ("queued", "running")]
+    failed = [label for label, state in statuses if state == "failed"]
+    if pending:
+        st.sidebar.caption("백그라운드 준비 중: " + ", ".join(pending))
+    elif failed:
+        st.sidebar.caption("백그라운드 준비 실패: " + ", ".join(failed))
+    else:
+        st.sidebar.caption("모든 페이지가 준비되었습니다.")
@@ -0,0 +1,21 @@
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# 무거운 계산(순열 중요도, 보고서 렌더링 등)을 나눠 처리하는 작업 프로세스 풀 공용 설정
+
+
+def default_workers(tasks=None):
+    # 서버 프로세스가 쓸 코어 하나를 남기고, 작업 수보다 많이 만들지 않음
+    workers = max(1, (os.cpu_count() or 2) - 1)
+    return workers if tasks is None else max(1, min(tasks, workers))
+
+
+def spawn_executor(max_workers=None, initializer=None, initargs=()):
+    # Streamlit 서버는 여러 스레드로 동작하므로 fork 대신 spawn 으로 작업 프로세스를 만듦
+    return ProcessPoolExecutor(
+        max_workers=max_workers or default_workers(),
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=initializer,
+        initargs=initargs,
+    )
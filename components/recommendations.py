@@ -2,6 +2,13 @@ import pandas as pd
 import streamlit as st
 import plotly.graph_objects as go
 import plotly.express as px
+from components.data_preparation import target_columns
+from components.dataset_store import session_dataset, show_expired_warning
+from components.permutation_importance import permutation_importance_status
+from components.peer_baselines import get_peer_baselines
+from components.peer_neighbors import LEVEL_COLUMNS, get_neighbor_index
+from components.score_history import student_trajectory
+from components.student_reports import show_report_batch
 
 # 개선 방안 추천 데이터 정의
 improvement_suggestions = {
@@ -12,7 +19,7 @@ improvement_suggestions = {
     "전공체험_소요시간": "전공 체험 프로그램(캠프, 워크숍 등)에 자주 참여. 교수님 또는 전문가와 상담하여 현장 경험 기회 탐색. 학과 연구실 참여 또는 전공 관련 실험에 자발적 참여.",
     "근로장학_근무시간": "학교 근로 장학 기회 적극 탐색 및 지원. 학교 내 부서에서 근무하며 행정 또는 지원 업무 경험. 시간 관리 능력을 통해 근무 시간 활용도를 높임.",
     "일경험_근로시간": "파트타임 직업 또는 인턴십 경험 확대. 전공과 연관된 일경험 기회를 우선적으로 탐색. 기업 연계 프로그램이나 산업체 견학에 참여.",
-    "교수교류": "정기적으로 교수님과의 상담 시간을 요청. 연구 프로젝트 또는 학과 행사에서 교수와 협력. 교수님의 강의 시간 외 질의응답을 통해 학업적 도움 요청.",
+    "교수교류빈도": "정기적으로 교수님과의 상담 시간을 요청. 연구 프로젝트 또는 학과 행사에서 교수와 협력. 교수님의 강의 시간 외 질의응답을 통해 학업적 도움 요청.",
     "선후배교류": "학과 동아리, 멘토링 프로그램 등을 통해 선후배와 교류. 선배의 진로 경험담 및 조언을 적극적으로 청취. 학과 행사나 친목 모임에서 네트워크 형성.",
     "친구교류": "그룹 스터디 참여를 통해 학업적 협력 강화. 다양한 배경의 친구들과의 대화와 활동으로 새로운 시각 확보. 교내 및 지역 커뮤니티 활동에 참여.",
     "창의융합": "창의력 관련 워크숍, 브레인스토밍 세션 참여. 다양한 전공의 학생들과 협력하여 새로운 아이디어 개발. 복합 문제를 해결하는 프로젝트 경험 확대.",
@@ -29,8 +36,9 @@ improvement_suggestions = {
 
 # 학생 개선 방안 표시 함수
 def show_improvement_suggestions():
-    if "processed_data" in st.session_state and "model" in st.session_state:
-        data = st.session_state["processed_data"].copy()
+    processed_data = session_dataset("processed_data")
+    if processed_data is not None and "model" in st.session_state:
+        data = processed_data
         model = st.session_state.model
         st.subheader("개인별 상세 분석")
         st.markdown("""
@@ -54,6 +62,9 @@ def show_improvement_suggestions():
     </div>
     """, unsafe_allow_html=True)
 
+        # 학기 초 상담용: 선택한 학생들의 보고서를 한 번에 생성
+        show_report_batch(data, st.session_state.processed_data_key, target_columns, improvement_suggestions)
+
         # Feature 중요도 기반 결정적인 변수 추출
         if hasattr(model, "feature_importances_"):
             feature_importances = pd.Series(
@@ -70,6 +81,18 @@ def show_improvement_suggestions():
 
         # 기본적으로 포함할 컬럼
         base_columns = ["학번", "학년", "전공", "재학학기", "성취 수준"]
+
+        # 업로드한 데이터 기준 순열 중요도가 계산되어 있으면 상위 특성을 결정적인 변수로 사용
+        importance_status, importance = permutation_importance_status(
+            st.session_state.get("model_hash"), st.session_state.get("uploaded_data_key")
+        )
+        if importance is not None:
+            key_features = [
+                col for col in importance["특성"] if col in data.columns and col not in base_columns
+            ][:5] or key_features
+        elif importance_status == "running":
+            st.caption("업로드한 데이터 기준 특성 중요도를 계산하는 중입니다. 완료되면 결정적인 변수가 갱신됩니다.")
+
         display_columns = base_columns + key_features
 
         # 학생 선택 옵션
@@ -79,15 +102,6 @@ def show_improvement_suggestions():
         # 선택된 학생 데이터 필터링
         student_data = data[data["이름"] == selected_student]
 
-        # 주요 열 정의
-        target_columns = [
-            "동아리수", "자격증수", "토익수준", "수상빈도", 
-            "전공체험_소요시간", "근로장학_근무시간", "일경험_근로시간",
-            "교수교류빈도", "선후배교류", "친구교류", 
-            "창의융합", "문제해결", "의사소통", "리더십",
-            "학습지도", "전공기초", "전공전문성", "자기관리", "대인관계", "글로벌시민의식"
-        ]
-        
         # 값이 1 이하인 항목의 인덱스 및 값 표시
         if not student_data.empty:
             st.markdown(f"### **{selected_student} 학생 상세 분석**")
@@ -147,16 +161,37 @@ def show_improvement_suggestions():
 
             st.plotly_chart(fig, use_container_width=True)
 
+            # 실행별 스코어 이력 (학기별 추이)
+            history = student_trajectory(student_data["학번"].iloc[0])
+            if len(history) > 1:
+                st.subheader(f"{selected_student} 학생의 스코어 추이")
+                history_chart = px.line(
+                    history, x="run_at", y="score", markers=True, hover_data=["성취 수준"],
+                    labels={"run_at": "실행 시각", "score": score_column},
+                )
+                st.plotly_chart(history_chart, use_container_width=True)
+
             st.write("위의 데이터는 선택된 학생의 예측 결과와 관련된 주요 변수와 기본 정보를 포함합니다.")
            # 값이 평균의 하위 퍼센트에 해당하는 항목 필터링
-            st.subheader("평균 하위 퍼센트 기준 설정")
+            st.subheader("동료 그룹(같은 전공·학년) 평균 하위 퍼센트 기준 설정")
             percentage_threshold = st.slider("하위 퍼센트 기준을 선택하세요 (기본값: 30%)", min_value=1, max_value=50, value=30, step=1)
 
-            low_thresholds = data[target_columns].mean() * (percentage_threshold / 100)  # 사용자 설정 기준
-            below_threshold = student_data[target_columns].loc[:, (student_data[target_columns] <= low_thresholds).any()]
+            # 같은 전공·학년 동료 그룹의 기준값 (데이터셋마다 한 번만 계산, 여기서는 조회만)
+            peer_baselines = get_peer_baselines(st.session_state.processed_data_key, data, tuple(target_columns))
+            major, grade = student_data["전공"].iloc[0], student_data["학년"].iloc[0]
+            peer_baseline = peer_baselines.lookup(major, grade)
+            with st.expander(f"동료 그룹({major} {grade}학년, {peer_baselines.group_size(major, grade)}명) 기준값과 비교"):
+                peer_table = peer_baseline.T
+                peer_table.insert(0, "학생 값", student_data[peer_baselines.columns].iloc[0].to_numpy())
+                st.dataframe(peer_table.round(2), use_container_width=True)
+
+            low_thresholds = peer_baseline.loc["평균"] * (percentage_threshold / 100)  # 사용자 설정 기준
+            below_threshold = student_data[peer_baselines.columns].loc[
+                :, (student_data[peer_baselines.columns] <= low_thresholds).any()
+            ]
 
             if not below_threshold.empty:
-                st.subheader(f"평균 하위 {percentage_threshold}%에 해당하는 항목")
+                st.subheader(f"동료 그룹 평균 하위 {percentage_threshold}%에 해당하는 항목")
                 for col in below_threshold.columns:
                     low_values = below_threshold[below_threshold[col] <= low_thresholds[col]][col]
                     if not low_values.empty:
@@ -179,11 +214,38 @@ def show_improvement_suggestions():
                         if st.button("관련 대학프로그램 소개 전송", key=f"program_button_{col}"):
                            st.write(f"{col} 관련 대학 프로그램 정보를 학생에게 전송했습니다!")
             else:
-                st.info(f"평균 하위 {percentage_threshold}%에 해당하는 항목이 없습니다.")
+                st.info(f"동료 그룹 평균 하위 {percentage_threshold}%에 해당하는 항목이 없습니다.")
+
+            # 비슷한 특성을 가졌지만 고성취인 학생 (스코어링 결과마다 한 번 만든 KD-트리에서 조회)
+            st.markdown("---")
+            st.subheader(f"{selected_student} 학생과 비슷한 고성취 학생")
+            col1, col2, col3 = st.columns(3)
+            feature_set = col1.radio("비교 특성", ["주요 항목", "5개 수준 지표"], horizontal=True)
+            n_neighbors = col2.slider("학생 수", min_value=1, max_value=10, value=5)
+            same_major = col3.checkbox("같은 전공에서만 찾기", value=True)
+
+            neighbor_columns = target_columns if feature_set == "주요 항목" else LEVEL_COLUMNS
+            neighbor_index = get_neighbor_index(st.session_state.processed_data_key, data, tuple(neighbor_columns))
+            student_position = data.index.get_loc(student_data.index[0])
+            neighbor_positions, distances = neighbor_index.query(
+                student_position, n_neighbors, student_data["전공"].iloc[0] if same_major else None
+            )
+            if len(neighbor_positions):
+                neighbors = data.iloc[neighbor_positions][["이름", "전공", "학년", score_column]].assign(거리=distances)
+                st.dataframe(neighbors.round(2), use_container_width=True, hide_index=True)
+                differences = neighbor_index.differences(student_position, neighbor_positions).head(5)
+                st.markdown("**가장 차이가 큰 항목**")
+                st.plotly_chart(
+                    px.bar(differences, x="차이 (표준편차)", y="특성", orientation="h",
+                           hover_data=["학생 값", "비슷한 고성취 평균"]),
+                    use_container_width=True,
+                )
+            else:
+                st.info("비교할 고성취 학생이 없습니다.")
 
             # 추가 설명
             
         else:
             st.warning("선택된 학생에 대한 데이터가 없습니다.")
-    else:
+    elif not show_expired_warning():
         st.warning("먼저 '취업 성취 스코어' 페이지에서 데이터를 처리하세요.")
@@ -0,0 +1,138 @@
+import uuid
+from datetime import datetime
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from components.cache_paths import cache_dir
+from components.data_preparation import SCORE_COLUMN
+
+# 스코어 이력 저장소: run_date / model_hash 로 파티션된 Parquet 파일
+# 실행마다 전체 학생의 스코어를 기록 (변경된 학생만 다시 스코어링한 경우에도 합친 결과를 기록)
+HISTORY_DIR_NAME = "score_history"
+TIER_COLUMN = "성취 수준"
+TIER_RANK = {"저성취": 0, "중성취": 1, "고성취": 2}
+
+HISTORY_SCHEMA = pa.schema([
+    ("run_id", pa.string()),
+    ("run_at", pa.timestamp("s")),
+    ("학번", pa.string()),
+    ("전공", pa.dictionary(pa.int8(), pa.string())),
+    ("score", pa.float32()),
+    (TIER_COLUMN, pa.dictionary(pa.int8(), pa.string())),
+])
+PARTITIONING = ds.partitioning(
+    pa.schema([("run_date", pa.string()), ("model_hash", pa.string())]), flavor="hive"
+)
+
+
+def history_root():
+    return cache_dir(HISTORY_DIR_NAME)
+
+
+def append_run(processed_data, model_hash, run_at=None):
+    """
+    스코어링 결과(학번, 전공, 스코어, 성취 수준)를 이력 저장소에 추가.
+    """
+    run_at = (run_at or datetime.now()).replace(microsecond=0)
+    run_id = f"{run_at:%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+
+    frame = pd.DataFrame({
+        "run_id": run_id,
+        "run_at": run_at,
+        "학번": processed_data["학번"].astype(str),
+        "전공": processed_data["전공"].astype(str),
+        "score": processed_data[SCORE_COLUMN],
+        TIER_COLUMN: processed_data[TIER_COLUMN].astype(str),
+    }).sort_values("학번")
+    table = pa.Table.from_pandas(frame, schema=HISTORY_SCHEMA, preserve_index=False)
+
+    partition_dir = history_root() / f"run_date={run_at:%Y-%m-%d}" / f"model_hash={model_hash}"
+    partition_dir.mkdir(parents=True, exist_ok=True)
+    # 학번으로 정렬해 두어 학생 단위 조회 시 row group 통계로 건너뛸 수 있게 함
+    pq.write_table(table, partition_dir / f"part-{run_id}.parquet", row_group_size=50_000)
+    return run_id
+
+
+def _dataset(paths=None):
+    if paths is None:
+        return ds.dataset(history_root(), format="parquet", partitioning=PARTITIONING, schema=_full_schema())
+    return ds.dataset(
+        [str(path) for path in paths], format="parquet", partitioning=PARTITIONING,
+        partition_base_dir=str(history_root()), schema=_full_schema(),
+    )
+
+
+def _full_schema():
+    return pa.schema(list(HISTORY_SCHEMA) + list(PARTITIONING.schema))
+
+
+def list_runs(model_hash=None):
+    """
+    저장된 실행 목록을 파일 경로만으로 조회 (데이터는 읽지 않음).
+    """
+    runs = []
+    for path in history_root().glob("run_date=*/model_hash=*/part-*.parquet"):
+        run_hash = path.parent.name.split("=", 1)[1]
+        if model_hash is not None and run_hash != model_hash:
+            continue
+        runs.append({
+            "run_id": path.stem[len("part-"):],
+            "run_date": path.parent.parent.name.split("=", 1)[1],
+            "model_hash": run_hash,
+            "path": path,
+        })
+    return sorted(runs, key=lambda run: run["run_id"])
+
+
+def student_trajectory(student_id):
+    """
+    한 학생의 실행별 스코어 추이.
+    """
+    table = _dataset().to_table(
+        columns=["run_at", "model_hash", "score", TIER_COLUMN],
+        filter=ds.field("학번") == str(student_id),
+    )
+    return table.to_pandas().sort_values("run_at").reset_index(drop=True)
+
+
+def tier_drops(model_hash=None):
+    """
+    직전 실행 대비 성취 수준이 낮아진 학생 목록.
+    """
+    runs = list_runs(model_hash)
+    if len(runs) < 2:
+        return pd.DataFrame(columns=["학번", "이전 성취 수준", TIER_COLUMN, "이전 스코어", "score"])
+
+    columns = ["학번", "score", TIER_COLUMN]
+    before = _dataset([runs[-2]["path"]]).to_table(columns=columns).to_pandas()
+    after = _dataset([runs[-1]["path"]]).to_table(columns=columns).to_pandas()
+
+    merged = after.merge(before, on="학번", suffixes=("", "_before"))
+    dropped = merged[
+        merged[TIER_COLUMN].astype(str).map(TIER_RANK) < merged[f"{TIER_COLUMN}_before"].astype(str).map(TIER_RANK)
+    ]
+    return dropped.rename(columns={
+        f"{TIER_COLUMN}_before": "이전 성취 수준", "score_before": "이전 스코어",
+    })[["학번", "이전 성취 수준", TIER_COLUMN, "이전 스코어", "score"]].reset_index(drop=True)
+
+
+def tier_mix_by_major(model_hash=None):
+    """
+    실행 시점별, 전공별 성취 수준 구성비. 필요한 컬럼만 배치 단위로 집계.
+    """
+    paths = [run["path"] for run in list_runs(model_hash)]
+    counts = None
+    for batch in _dataset(paths).to_batches(columns=["run_at", "전공", TIER_COLUMN]):
+        batch_counts = batch.to_pandas().astype({"전공": str, TIER_COLUMN: str}).value_counts(
+            ["run_at", "전공", TIER_COLUMN]
+        )
+        counts = batch_counts if counts is None else counts.add(batch_counts, fill_value=0)
+
+    if counts is None:
+        return pd.DataFrame(columns=["run_at", "전공", TIER_COLUMN, "count", "ratio"])
+    mix = counts.astype(int).rename("count").reset_index()
+    mix["ratio"] = mix["count"] / mix.groupby(["run_at", "전공"])["count"].transform("sum")
+    return mix.sort_values(["run_at", "전공", TIER_COLUMN]).reset_index(drop=True)
@@ -0,0 +1,230 @@
+import json
+import time
+from datetime import datetime
+
+import streamlit as st
+
+from components.arrow_files import TEMP_SUFFIX, read_table, write_atomic, write_dataframe, write_table
+from components.cache_paths import cache_dir
+
+# 스코어링 결과 스냅샷: 새로고침/서버 재시작 후에도 다시 업로드·스코어링하지 않고 바로 복원
+# 데이터셋은 키별 Arrow IPC 파일로 한 번만 저장하고, 복원 시 메모리 맵으로 읽어 크기와 무관하게 빠르게 사용
+# (업로드 페이지에서 목록만 볼 때는 pyarrow/joblib 을 import 하지 않도록 함수 안에서 import)
+SNAPSHOT_DIR_NAME = "snapshots"
+MAX_SNAPSHOTS = 5
+
+
+def _root():
+    return cache_dir(SNAPSHOT_DIR_NAME)
+
+
+def _frame_path(key):
+    return cache_dir(f"{SNAPSHOT_DIR_NAME}/frames") / f"{key}.arrow"
+
+
+def _sort_index_path(key):
+    return cache_dir(f"{SNAPSHOT_DIR_NAME}/indexes") / f"{key}.sort.arrow"
+
+
+def _group_distributions_path(key):
+    return cache_dir(f"{SNAPSHOT_DIR_NAME}/indexes") / f"{key}.groups.arrow"
+
+
+def _model_path(model_hash):
+    return cache_dir(f"{SNAPSHOT_DIR_NAME}/models") / f"{model_hash}.joblib"
+
+
+def write_frame(data, key):
+    path = _frame_path(key)
+    if not path.exists():
+        write_dataframe(data, path)
+
+
+def read_frame(key):
+    """
+    메모리 맵으로 데이터셋을 읽음. split_blocks 로 컬럼을 합치지 않으므로 대부분 복사 없이 변환됨.
+    """
+    path = _frame_path(key)
+    return read_table(path).to_pandas(split_blocks=True) if path.exists() else None
+
+
+def write_sort_index(sort_index, key):
+    import pyarrow as pa
+
+    path = _sort_index_path(key)
+    if not path.exists():
+        write_table(pa.table({name: positions for name, positions in sort_index.items()}), path)
+
+
+def load_sort_index(key):
+    path = _sort_index_path(key)
+    if not path.exists():
+        return None
+    table = read_table(path)
+    return {name: table[name].to_numpy() for name in table.column_names}
+
+
+def write_group_distributions(group_distributions, key):
+    """
+    특성별 비율표를 (특성, 값) 행 x 성취 수준 열의 표 하나로 저장. 값 라벨의 dtype 은 스키마 메타데이터로 보관.
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    path = _group_distributions_path(key)
+    if path.exists():
+        return
+    tiers = list(next(iter(group_distributions.values())).index) if group_distributions else []
+    frame = pd.concat([
+        pd.DataFrame({"feature": feature, "value": ratios.columns.astype(str)}).join(
+            pd.DataFrame(ratios.T.to_numpy(), columns=tiers)
+        )
+        for feature, ratios in group_distributions.items()
+    ] or [pd.DataFrame(columns=["feature", "value"])], ignore_index=True)
+    value_dtypes = {feature: str(ratios.columns.dtype) for feature, ratios in group_distributions.items()}
+    table = pa.Table.from_pandas(frame, preserve_index=False).replace_schema_metadata({
+        "tiers": json.dumps(tiers, ensure_ascii=False),
+        "value_dtypes": json.dumps(value_dtypes, ensure_ascii=False),
+    })
+    write_table(table, path)
+
+
+def load_group_distributions(key):
+    import numpy as np
+    import pandas as pd
+
+    path = _group_distributions_path(key)
+    if not path.exists():
+        return None
+    table = read_table(path)
+    tiers = json.loads(table.schema.metadata[b"tiers"])
+    value_dtypes = json.loads(table.schema.metadata[b"value_dtypes"])
+    frame = table.to_pandas()
+    group_distributions = {}
+    for feature, rows in frame.groupby("feature", sort=False):
+        values = rows["value"]
+        values = values == "True" if value_dtypes[feature] == "bool" else values.astype(value_dtypes[feature])
+        group_distributions[feature] = pd.DataFrame(
+            rows[tiers].to_numpy(dtype=np.float32).T,
+            index=pd.Index(tiers, name="성취 수준"),
+            columns=pd.Index(values.to_numpy(), name=feature),
+        )
+    return group_distributions
+
+
+def save_snapshot(scored_key, scored_data, processed_key, uploaded_key, uploaded_data, models, model_hashes,
+                  model_name, cut_points, sort_index=None, group_distributions=None):
+    """
+    스코어링 결과(기본 기준), 원본 데이터, 인덱스와 모델 참조(모델 해시 + 모델 파일)를 저장.
+    성취 수준 기준(cut_points)은 값만 저장하고, 인덱스는 그 기준을 적용한 데이터셋 키(processed_key)로 저장.
+    """
+    import joblib
+
+    write_frame(scored_data, scored_key)
+    write_frame(uploaded_data, uploaded_key)
+    if sort_index is not None:
+        write_sort_index(sort_index, processed_key)
+    if group_distributions is not None:
+        write_group_distributions(group_distributions, processed_key)
+    for name, model in models.items():
+        path = _model_path(model_hashes[name])
+        if not path.exists():
+            write_atomic(path, lambda temp_path: joblib.dump(model, temp_path))
+
+    meta = {
+        "scored_key": scored_key,
+        "processed_key": processed_key,
+        "uploaded_key": uploaded_key,
+        "models": {name: model_hashes[name] for name in models},
+        "model_name": model_name,
+        "tier_cut_points": list(cut_points),
+        "rows": len(scored_data),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+    }
+    meta_path = _root() / f"{processed_key}.json"
+    write_atomic(meta_path, lambda temp_path: temp_path.write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8"))
+    prune_snapshots()
+
+
+def list_snapshots():
+    snapshots = []
+    for path in _root().glob("*.json"):
+        try:
+            snapshots.append(json.loads(path.read_text(encoding="utf-8")))
+        except (OSError, ValueError):
+            continue
+    return sorted(snapshots, key=lambda meta: meta["created_at"], reverse=True)
+
+
+def prune_snapshots(max_snapshots=MAX_SNAPSHOTS):
+    """
+    최근 max_snapshots 개만 남기고, 더 이상 참조되지 않는 데이터셋/인덱스/모델 파일을 삭제.
+    """
+    snapshots = list_snapshots()
+    for meta in snapshots[max_snapshots:]:
+        (_root() / f"{meta['processed_key']}.json").unlink(missing_ok=True)
+    kept = snapshots[:max_snapshots]
+    kept_keys = {meta[name] for meta in kept for name in ("scored_key", "processed_key", "uploaded_key")}
+    kept_models = {model_hash for meta in kept for model_hash in meta["models"].values()}
+    for path in list(_root().glob("frames/*.arrow")) + list(_root().glob("indexes/*")):
+        # 다른 세션이 쓰는 중인 임시 파일은 건드리지 않음
+        if path.suffix != TEMP_SUFFIX and path.name.split(".", 1)[0] not in kept_keys:
+            path.unlink(missing_ok=True)
+    for path in _root().glob("models/*.joblib"):
+        if path.stem not in kept_models:
+            path.unlink(missing_ok=True)
+
+
+def restore_snapshot(meta):
+    """
+    스냅샷을 공유 저장소에 올리고 세션 상태를 스코어링 직후 상태로 되돌림.
+    """
+    import joblib
+    from components.dataset_store import get_dataset_store, tiered_dataset
+
+    store = get_dataset_store()
+    scored_key = meta["scored_key"]
+    cut_points = tuple(meta["tier_cut_points"])
+    # 다른 세션이 이미 복원했거나 같은 데이터를 쓰고 있으면 저장소의 데이터를 그대로 공유
+    for key in (meta["uploaded_key"], scored_key):
+        if store.get(key) is None:
+            data = read_frame(key)
+            if data is None:
+                raise FileNotFoundError(f"스냅샷 데이터 파일이 없습니다: {key}")
+            store.put(data, key)
+    processed_key, _ = tiered_dataset(scored_key, store.get(scored_key), cut_points)
+
+    models = {name: joblib.load(_model_path(model_hash)) for name, model_hash in meta["models"].items()}
+    model_name = meta["model_name"]
+    st.session_state.models = models
+    st.session_state.model_hashes = dict(meta["models"])
+    st.session_state.model_name = model_name
+    st.session_state.model = models[model_name]
+    st.session_state.model_hash = meta["models"][model_name]
+    st.session_state.uploaded_data_key = meta["uploaded_key"]
+    st.session_state.scored_data_key = scored_key
+    st.session_state.processed_data_key = processed_key
+    st.session_state.tier_cut_points = cut_points
+    for key in ("pending_score_ids", "db_sync", "data_file_id"):
+        st.session_state.pop(key, None)
+
+
+def show_snapshot_restore():
+    snapshots = list_snapshots()
+    if not snapshots:
+        return
+    with st.expander("이전 스코어링 결과 복원", expanded="model" not in st.session_state):
+        labels = {
+            f"{meta['created_at']} · {meta['model_name']} · {meta['rows']:,}명": meta for meta in snapshots
+        }
+        selected = st.selectbox("저장된 결과", list(labels))
+        if st.button("복원"):
+            start = time.perf_counter()
+            try:
+                restore_snapshot(labels[selected])
+                st.session_state.snapshot_restore_ms = (time.perf_counter() - start) * 1000
+            except Exception as e:
+                st.error(f"스냅샷을 복원하지 못했습니다: {e}")
+        if "snapshot_restore_ms" in st.session_state:
+            st.caption(f"복원 시간: {st.session_state.snapshot_restore_ms:.0f} ms")
+
@@ -0,0 +1,194 @@
+import queue
+import sqlite3
+import sys
+from contextlib import contextmanager
+
+import pandas as pd
+import streamlit as st
+
+from components.dataset_store import clear_session_dataset, session_dataset, set_session_dataset
+
+# 학생 DB 연동 기본값 (아우누리 학생 DB 대신 로컬 SQLite 파일로 검증)
+DEFAULT_TABLE = "students"
+DEFAULT_UPDATED_AT_COLUMN = "updated_at"
+ID_COLUMN = "학번"
+
+
+class ConnectionPool:
+    """
+    SQLite 연결을 재사용하기 위한 간단한 커넥션 풀.
+    """
+
+    def __init__(self, db_path, size=4, timeout=10.0):
+        self.db_path = db_path
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=size)
+        self._slots = queue.Queue(maxsize=size)
+        for _ in range(size):
+            self._slots.put(None)
+
+    def _connect(self):
+        # 원본 DB를 보호하기 위해 읽기 전용으로 연결
+        conn = sqlite3.connect(
+            f"file:{self.db_path}?mode=ro", uri=True, timeout=self.timeout, check_same_thread=False
+        )
+        return conn
+
+    @contextmanager
+    def connection(self):
+        self._slots.get(timeout=self.timeout)
+        try:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                conn = self._connect()
+            broken = False
+            try:
+                yield conn
+            except sqlite3.Error:
+                broken = True
+                raise
+            finally:
+                if broken:
+                    conn.close()
+                else:
+                    self._idle.put_nowait(conn)
+        finally:
+            self._slots.put(None)
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+@st.cache_resource
+def get_connection_pool(db_path):
+    # 프로세스 전체에서 DB 경로별로 하나의 풀을 공유
+    return ConnectionPool(db_path)
+
+
+def _quote(identifier):
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _sql_value(value):
+    # sqlite3 는 numpy 스칼라(numpy.int64 등)를 BLOB 으로 바인딩하므로 파이썬 기본형으로 바꿔서 사용
+    return value.item() if hasattr(value, "item") else value
+
+
+def fetch_changed_rows(pool, table, updated_at_column, watermark=None, batch_size=5000):
+    """
+    마지막 동기화 기준점(updated_at, 학번) 이후 변경된 행만 조회.
+    """
+    updated_sql = _quote(updated_at_column)
+    id_sql = _quote(ID_COLUMN)
+    select_sql = f"SELECT * FROM {_quote(table)} "
+    order_sql = f"ORDER BY {updated_sql}, {id_sql} LIMIT ?"
+    where_sql = f"WHERE {updated_sql} > ? OR ({updated_sql} = ? AND {id_sql} > ?) "
+
+    chunks = []
+    with pool.connection() as conn:
+        # 키셋 페이지네이션으로 변경분을 배치 단위로 읽음 (첫 동기화는 전체)
+        while True:
+            if watermark is None:
+                chunk = pd.read_sql_query(select_sql + order_sql, conn, params=(batch_size,))
+            else:
+                last_updated, last_id = (_sql_value(value) for value in watermark)
+                chunk = pd.read_sql_query(
+                    select_sql + where_sql + order_sql, conn,
+                    params=(last_updated, last_updated, last_id, batch_size),
+                )
+            chunks.append(chunk)
+            if chunk.empty:
+                break
+            watermark = (_sql_value(chunk[updated_at_column].iloc[-1]), _sql_value(chunk[ID_COLUMN].iloc[-1]))
+            if len(chunk) < batch_size:
+                break
+
+    changed = pd.concat(chunks, ignore_index=True)
+    changed[ID_COLUMN] = changed[ID_COLUMN].astype(str)
+    changed = changed.drop(columns=[updated_at_column])
+    return changed, watermark
+
+
+def merge_changed_rows(cohort, changed):
+    """
+    캐시된 학생 데이터에 변경된 행을 학번 기준으로 병합.
+    """
+    if cohort is None or cohort.empty:
+        return changed.reset_index(drop=True)
+    unchanged = cohort[~cohort[ID_COLUMN].isin(changed[ID_COLUMN])]
+    return pd.concat([unchanged, changed], ignore_index=True)
+
+
+def show_student_db_sync():
+    """
+    학생 DB(SQLite)에서 변경분만 가져와 업로드 데이터에 반영하는 화면.
+    """
+    col1, col2, col3 = st.columns(3)
+    db_path = col1.text_input("학생 DB 경로 (SQLite)", value="student.db")
+    table = col2.text_input("테이블 이름", value=DEFAULT_TABLE)
+    updated_at_column = col3.text_input("수정 시각 컬럼", value=DEFAULT_UPDATED_AT_COLUMN)
+
+    source = (db_path, table, updated_at_column)
+    sync_state = st.session_state.get("db_sync")
+    if sync_state is None or sync_state["source"] != source:
+        sync_state = {"source": source, "watermark": None}
+
+    col4, col5 = st.columns(2)
+    sync_clicked = col4.button("변경분 동기화")
+    full_clicked = col5.button("전체 다시 불러오기")
+    if full_clicked:
+        sync_state = {"source": source, "watermark": None}
+        clear_session_dataset("uploaded_data")
+        clear_session_dataset("processed_data")
+
+    if sync_clicked or full_clicked:
+        try:
+            cohort = session_dataset("uploaded_data") if sync_state["watermark"] is not None else None
+            if cohort is None:
+                # 동기화해 둔 학생 데이터가 캐시에서 삭제되었으면 변경분이 아니라 전체를 다시 불러옴
+                sync_state = {"source": source, "watermark": None}
+            pool = get_connection_pool(db_path)
+            changed, watermark = fetch_changed_rows(pool, table, updated_at_column, sync_state["watermark"])
+            set_session_dataset("uploaded_data", merge_changed_rows(cohort, changed))
+            sync_state["watermark"] = watermark
+            st.session_state.db_sync = sync_state
+            st.session_state.pop("data_file_id", None)
+
+            # 변경된 학생만 다시 스코어링하도록 표시
+            if cohort is None:
+                clear_session_dataset("processed_data")
+            elif not changed.empty:
+                pending = set(st.session_state.get("pending_score_ids", set()))
+                st.session_state.pending_score_ids = pending | set(changed[ID_COLUMN])
+            st.success(f"학생 DB에서 {len(changed)}건의 변경분을 동기화했습니다.")
+        except Exception as e:
+            st.error(f"학생 DB 동기화 중 오류가 발생했습니다: {e}")
+
+    if sync_state["watermark"] is not None:
+        st.caption(f"마지막 동기화 기준점: {sync_state['watermark'][0]} / {ID_COLUMN} {sync_state['watermark'][1]}")
+
+
+def create_standin_db(csv_path, db_path, table=DEFAULT_TABLE, updated_at_column=DEFAULT_UPDATED_AT_COLUMN):
+    """
+    CSV 파일로 로컬 SQLite 학생 DB(검증용)를 생성.
+    """
+    data = pd.read_csv(csv_path, dtype={ID_COLUMN: str})
+    if updated_at_column not in data.columns:
+        data[updated_at_column] = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+    with sqlite3.connect(db_path) as conn:
+        data.to_sql(table, conn, if_exists="replace", index=False)
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {_quote(table + '_sync_idx')} "
+            f"ON {_quote(table)} ({_quote(updated_at_column)}, {_quote(ID_COLUMN)})"
+        )
+    conn.close()
+
+
+if __name__ == "__main__":
+    # 사용법: python -m components.student_db <csv 경로> <db 경로>
+    create_standin_db(sys.argv[1], sys.argv[2])
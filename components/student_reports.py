@@ -0,0 +1,247 @@
+import html
+import os
+import re
+import shutil
+import subprocess
+import uuid
+import zipfile
+from collections import deque
+from pathlib import Path
+from string import Template
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from components.cache_paths import cache_dir
+from components.data_preparation import SCORE_COLUMN, TIER_LABELS
+from components.dataset_store import bytes_hash
+from components.peer_baselines import get_peer_baselines
+from components.process_pool import default_workers, spawn_executor
+
+# 학기 초 상담용 학생별 보고서 일괄 생성: 한 번 만든 템플릿으로 작업 프로세스들이 청크 단위로 렌더링하고 zip 에 바로 기록
+REPORTS_DIR_NAME = "reports"
+MAX_REPORT_ARCHIVES = 5  # 최근에 만든 보고서 zip 만 남김
+CHUNK_SIZE = 200
+PDF_RENDERER = "wkhtmltopdf"  # 설치되어 있으면 PDF 도 생성 (로컬 렌더러)
+
+REPORT_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<title>$name 학생 상담 보고서</title>
+<style>
+body { font-family: "Malgun Gothic", "Apple SD Gothic Neo", sans-serif; margin: 32px; color: #222; }
+h1 { font-size: 22px; border-bottom: 2px solid #333; padding-bottom: 8px; }
+table.summary td { padding: 4px 16px 4px 0; }
+.area { border-left: 5px solid #ff4b4b; background: #f6f6f6; padding: 10px 14px; margin: 10px 0; }
+.area p { margin: 0 0 6px 0; }
+.muted { color: #666; font-size: 13px; }
+</style>
+</head>
+<body>
+<h1>$name 학생 상담 보고서</h1>
+<table class="summary">
+<tr><td>학번</td><td>$student_id</td><td>전공 / 학년</td><td>$major / $grade학년</td></tr>
+<tr><td>취업 성공 가능 스코어</td><td><b>$score%</b></td><td>성취 수준</td><td><b>$tier</b></td></tr>
+<tr><td>스코어 위치</td><td colspan="3">전체 $cohort_size명 중 상위 $rank_percent% (전체 평균 $cohort_mean%)</td></tr>
+</table>
+<h2>개선이 필요한 항목</h2>
+<p class="muted">같은 전공·학년 동료 그룹 평균의 $threshold% 이하인 항목입니다.</p>
+$weak_areas
+</body>
+</html>
+""")
+WEAK_AREA_TEMPLATE = Template("""<div class="area">
+<p><b>$column</b>: 학생 $value / 동료 그룹 평균 $peer_mean</p>
+<p>$suggestion</p>
+</div>""")
+NO_WEAK_AREAS = "<p>해당하는 항목이 없습니다.</p>"
+
+_worker_suggestions = None
+_worker_renderer = None
+
+
+def pdf_renderer():
+    return shutil.which(PDF_RENDERER)
+
+
+def _init_worker(suggestions, renderer):
+    # 개선 방안 문구와 렌더러 경로는 작업 프로세스마다 한 번만 받음
+    global _worker_suggestions, _worker_renderer
+    _worker_suggestions = suggestions
+    _worker_renderer = renderer
+
+
+def _format_number(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".") if np.isfinite(value) else "-"
+
+
+def render_report(student, suggestions):
+    weak_areas = "\n".join(
+        WEAK_AREA_TEMPLATE.substitute(
+            column=html.escape(column),
+            value=_format_number(value),
+            peer_mean=_format_number(peer_mean),
+            suggestion=html.escape(suggestions.get(column, "")),
+        )
+        for column, value, peer_mean in student["weak_areas"]
+    )
+    return REPORT_TEMPLATE.substitute(
+        name=html.escape(str(student["이름"])),
+        student_id=html.escape(str(student["학번"])),
+        major=html.escape(str(student["전공"])),
+        grade=html.escape(str(student["학년"])),
+        score=_format_number(student["score"]),
+        tier=html.escape(str(student["성취 수준"])),
+        rank_percent=_format_number(student["rank_percent"]),
+        cohort_size=student["cohort_size"],
+        cohort_mean=_format_number(student["cohort_mean"]),
+        threshold=student["threshold"],
+        weak_areas=weak_areas or NO_WEAK_AREAS,
+    )
+
+
+def _file_stem(student):
+    return re.sub(r'[\\/:*?"<>|\s]+', "_", f"{student['학번']}_{student['이름']}")
+
+
+def _render_chunk(students, with_pdf):
+    """
+    학생 청크를 렌더링해 (zip 안 파일 이름, 내용) 목록으로 반환.
+    """
+    files = []
+    for student in students:
+        document = render_report(student, _worker_suggestions).encode("utf-8")
+        stem = _file_stem(student)
+        files.append((f"html/{stem}.html", document))
+        if with_pdf and _worker_renderer:
+            pdf = subprocess.run(
+                [_worker_renderer, "--quiet", "--encoding", "utf-8", "-", "-"],
+                input=document, capture_output=True, check=True,
+            ).stdout
+            files.append((f"pdf/{stem}.pdf", pdf))
+    return files
+
+
+def iter_student_chunks(data, dataset_key, positions, columns, threshold, chunk_size=CHUNK_SIZE):
+    """
+    보고서에 들어갈 값을 전체 학생 기준으로 한 번에 계산하고, positions 학생만 chunk_size 명씩 반환.
+    스코어 위치와 동료 그룹 평균은 선택한 학생이 아니라 전체 학생 기준 (개인별 분석과 같은 동료 그룹 기준값 사용).
+    """
+    baselines = get_peer_baselines(dataset_key, data, tuple(columns))
+    columns = baselines.columns
+    values = data[columns].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=np.float64)
+    peer_values = baselines.row_statistic(data).astype(np.float64)
+    weak = values <= peer_values * (threshold / 100)
+
+    scores = data[SCORE_COLUMN].to_numpy(dtype=np.float64)
+    rank_percent = data[SCORE_COLUMN].rank(ascending=False, pct=True).to_numpy() * 100
+    cohort_mean = float(np.nanmean(scores))
+    info = data[["학번", "이름", "전공", "학년", "성취 수준"]]
+
+    for start in range(0, len(positions), chunk_size):
+        chunk_positions = positions[start:start + chunk_size]
+        records = info.iloc[chunk_positions].astype(str).to_dict("records")
+        for position, record in zip(chunk_positions, records):
+            record.update(
+                score=scores[position],
+                rank_percent=rank_percent[position],
+                cohort_size=len(data),
+                cohort_mean=cohort_mean,
+                threshold=threshold,
+                weak_areas=[
+                    (columns[i], values[position, i], peer_values[position, i])
+                    for i in np.flatnonzero(weak[position])
+                ],
+            )
+        yield records
+
+
+def write_report_archive(data, dataset_key, positions, columns, suggestions, threshold, file, with_pdf=False,
+                         max_workers=None, chunk_size=CHUNK_SIZE, progress=None):
+    """
+    positions 학생들의 보고서를 프로세스 풀에서 렌더링해 zip(file)에 기록.
+    처리 중인 청크 수를 작업 프로세스 수의 2배로 제한해 학생 수와 관계없이 메모리 사용량이 일정함.
+    """
+    renderer = pdf_renderer() if with_pdf else None
+    max_workers = max_workers or default_workers()
+    done = 0
+    with spawn_executor(max_workers, _init_worker, (suggestions, renderer)) as executor, zipfile.ZipFile(file, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        pending = deque()
+
+        def write_oldest():
+            nonlocal done
+            chunk_files = pending.popleft().result()
+            for name, content in chunk_files:
+                archive.writestr(name, content)
+            done += sum(name.startswith("html/") for name, _ in chunk_files)
+            if progress:
+                progress(done, len(positions))
+
+        for students in iter_student_chunks(data, dataset_key, positions, columns, threshold, chunk_size):
+            pending.append(executor.submit(_render_chunk, students, renderer is not None))
+            if len(pending) >= max_workers * 2:
+                write_oldest()
+        while pending:
+            write_oldest()
+    return done
+
+
+def prune_report_archives(max_archives=MAX_REPORT_ARCHIVES):
+    # 최근에 만든 max_archives 개만 남김 (다른 세션이 쓰는 중인 임시 파일은 건드리지 않음)
+    archives = sorted(cache_dir(REPORTS_DIR_NAME).glob("*.zip"), key=lambda path: path.stat().st_mtime, reverse=True)
+    for path in archives[max_archives:]:
+        path.unlink(missing_ok=True)
+
+
+def show_report_batch(data, dataset_key, columns, suggestions):
+    """
+    전공/성취 수준으로 대상 학생을 골라 상담 보고서 zip 을 만들고 내려받기 버튼을 표시.
+    """
+    with st.expander("학생별 상담 보고서 일괄 생성"):
+        col1, col2 = st.columns(2)
+        majors = col1.multiselect("전공", sorted(data["전공"].dropna().unique()), key="report_majors")
+        tiers = col2.multiselect("성취 수준", TIER_LABELS, key="report_tiers")
+        threshold = st.slider("개선 항목 기준 (동료 그룹 평균 대비 %)", min_value=1, max_value=50, value=30,
+                              key="report_threshold")
+        renderer = pdf_renderer()
+        with_pdf = st.checkbox("PDF 도 함께 생성", value=False, disabled=renderer is None, key="report_pdf",
+                               help=None if renderer else f"PDF 를 만들려면 {PDF_RENDERER} 를 설치하세요.")
+
+        mask = np.ones(len(data), dtype=bool)
+        if majors:
+            mask &= data["전공"].isin(majors).to_numpy()
+        if tiers:
+            mask &= data["성취 수준"].isin(tiers).to_numpy()
+        positions = np.flatnonzero(mask)
+        st.caption(f"대상 학생: {len(positions):,}명 (선택하지 않은 조건은 전체)")
+
+        if st.button("보고서 생성", disabled=not len(positions)):
+            # 같은 조건의 보고서는 같은 파일로, 다른 세션이 동시에 만들더라도 완성된 파일만 보이도록 임시 파일에 쓴 뒤 교체
+            selection_key = bytes_hash(positions.tobytes() + f"|{dataset_key}|{threshold}|{with_pdf}".encode())
+            path = cache_dir(REPORTS_DIR_NAME) / f"{selection_key}.zip"
+            temp_path = path.with_name(f"{path.name}.{uuid.uuid4().hex}.tmp")
+            progress_bar = st.progress(0.0, text="보고서 생성 중...")
+            try:
+                count = write_report_archive(
+                    data, dataset_key, positions, columns, suggestions, threshold, temp_path, with_pdf=with_pdf,
+                    progress=lambda done, total: progress_bar.progress(
+                        done / total, text=f"보고서 생성 중... {done:,}/{total:,}"
+                    ),
+                )
+                os.replace(temp_path, path)
+                prune_report_archives()
+                st.session_state.report_archive = str(path)
+                st.success(f"{count:,}명의 보고서를 만들었습니다.")
+            except Exception as e:
+                st.error(f"보고서 생성 중 오류가 발생했습니다: {e}")
+            finally:
+                temp_path.unlink(missing_ok=True)
+                progress_bar.empty()
+
+        archive = st.session_state.get("report_archive")
+        if archive and os.path.exists(archive):
+            # 다시 실행될 때마다 zip 을 읽지 않도록 내려받기를 누를 때만 파일을 읽음
+            st.download_button("보고서 zip 내려받기", Path(archive).read_bytes, file_name="상담보고서.zip",
+                               mime="application/zip")
@@ -20,14 +20,20 @@ def create_colored_table(data):
             performance = "🔴 저성취"
 
         # 테이블 행 데이터 추가
-        table.append({
+        table_row = {
             "학번": row["학번"],
             "이름": row["이름"],
             "학년": row.get("학년", "N/A"),
             "재학학기": row.get("재학학기", "N/A"),
             "취업 성공 가능 스코어 (%)": round(row["취업 성공 가능 스코어 (%)"], 2),
             "성취 수준": performance,
-        })
+        }
+        # 트리 간 스코어 구간 (구간이 성취 수준 기준에 걸치면 표시)
+        if "스코어 구간 하한 (%)" in row:
+            table_row["스코어 구간 (%)"] = f"{row['스코어 구간 하한 (%)']:.1f} ~ {row['스코어 구간 상한 (%)']:.1f}"
+            if row.get("성취 수준 불확실"):
+                table_row["성취 수준"] += " ⚠️"
+        table.append(table_row)
 
     return pd.DataFrame(table)
 
@@ -0,0 +1,188 @@
+import argparse
+import copy
+import time
+from io import BytesIO
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.tree._tree import Tree
+
+from components.data_preparation import SUCCESS_CLASS_INDEX, TIER_CUT_POINTS, prepare_data
+
+# 포레스트 압축 도구: 성취 수준(10/70 기준) 일치율을 유지하면서 트리 수와 깊이를 줄임
+
+
+def prune_tree_depth(estimator, max_depth):
+    """
+    결정 트리를 max_depth 까지만 남기고 그 아래 노드를 잘라낸 복사본을 반환.
+    잘린 노드는 해당 노드의 클래스 분포를 그대로 갖는 리프가 됨.
+    """
+    tree = estimator.tree_
+    if tree.max_depth <= max_depth:
+        return copy.deepcopy(estimator)
+
+    state = tree.__getstate__()
+    nodes, values = state["nodes"], state["values"]
+
+    # 너비 우선으로 유지할 노드를 모으고 새 인덱스를 부여
+    kept, depths = [0], [0]
+    position = 0
+    while position < len(kept):
+        node, depth = kept[position], depths[position]
+        if depth < max_depth and nodes["left_child"][node] != -1:
+            kept.extend([nodes["left_child"][node], nodes["right_child"][node]])
+            depths.extend([depth + 1, depth + 1])
+        position += 1
+    kept = np.array(kept)
+    new_index = {old: new for new, old in enumerate(kept)}
+
+    new_nodes = nodes[kept].copy()
+    for new, old in enumerate(kept):
+        left = nodes["left_child"][old]
+        if left == -1 or left not in new_index:
+            new_nodes["left_child"][new] = -1
+            new_nodes["right_child"][new] = -1
+            new_nodes["feature"][new] = -2
+            new_nodes["threshold"][new] = -2.0
+        else:
+            new_nodes["left_child"][new] = new_index[left]
+            new_nodes["right_child"][new] = new_index[nodes["right_child"][old]]
+
+    pruned = copy.deepcopy(estimator)
+    pruned.tree_ = Tree(*tree.__reduce__()[1])
+    pruned.tree_.__setstate__({
+        "max_depth": min(max_depth, max(depths)),
+        "node_count": len(kept),
+        "nodes": new_nodes,
+        "values": np.ascontiguousarray(values[kept]),
+    })
+    pruned.max_depth = max_depth
+    return pruned
+
+
+def tree_scores(estimators, data):
+    """
+    트리별 취업 성공 확률(%) 행렬 (트리 수 x 학생 수).
+    """
+    values = np.asarray(data, dtype=np.float32)
+    return np.vstack([
+        estimator.predict_proba(values)[:, SUCCESS_CLASS_INDEX] for estimator in estimators
+    ]) * 100
+
+
+def categorize_scores(scores):
+    # 성취 수준 코드 (0: 저성취, 1: 중성취, 2: 고성취), 여러 행을 한 번에 계산
+    return np.digitize(scores, TIER_CUT_POINTS)
+
+
+def select_trees(scores_by_tree, reference_tiers, target_agreement):
+    """
+    기준 성취 수준과의 일치율이 target_agreement 이상이 될 때까지 트리를 하나씩 추가 (greedy).
+    """
+    n_trees = len(scores_by_tree)
+    selected = []
+    remaining = list(range(n_trees))
+    running_sum = np.zeros(scores_by_tree.shape[1])
+    agreement = 0.0
+
+    while remaining:
+        candidate_means = (running_sum + scores_by_tree[remaining]) / (len(selected) + 1)
+        candidate_agreement = (categorize_scores(candidate_means) == reference_tiers).mean(axis=1)
+        best = int(np.argmax(candidate_agreement))
+        tree_index = remaining.pop(best)
+        selected.append(tree_index)
+        running_sum += scores_by_tree[tree_index]
+        agreement = candidate_agreement[best]
+        if agreement >= target_agreement:
+            break
+    return selected, agreement
+
+
+def compact_forest(model, data, target_agreement=0.98, max_depth=None):
+    """
+    검증 데이터에서 성취 수준 일치율을 유지하는 가장 작은 트리 부분집합으로 압축한 모델을 반환.
+    """
+    if not hasattr(model, "estimators_"):
+        raise ValueError("트리 앙상블(RandomForest) 모델만 압축할 수 있습니다.")
+
+    reference_tiers = categorize_scores(model.predict_proba(data)[:, SUCCESS_CLASS_INDEX] * 100)
+    estimators = model.estimators_
+    if max_depth is not None:
+        estimators = [prune_tree_depth(estimator, max_depth) for estimator in estimators]
+
+    selected, agreement = select_trees(tree_scores(estimators, data), reference_tiers, target_agreement)
+
+    compacted = copy.deepcopy(model)
+    compacted.estimators_ = [estimators[index] for index in sorted(selected)]
+    compacted.n_estimators = len(compacted.estimators_)
+    if max_depth is not None:
+        compacted.max_depth = max_depth
+    # 원본 전체 포레스트 기준으로 계산된 OOB 결과는 더 이상 맞지 않으므로 제거
+    for attr in ("oob_score_", "oob_decision_function_"):
+        if hasattr(compacted, attr):
+            delattr(compacted, attr)
+    return compacted, agreement
+
+
+def measure_model(model, data, labels=None, repeats=5):
+    """
+    모델 크기, 로드 시간, 예측 지연 시간(중앙값)과 정확도를 측정.
+    """
+    buffer = BytesIO()
+    joblib.dump(model, buffer)
+    payload = buffer.getvalue()
+
+    load_times, predict_times = [], []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        joblib.load(BytesIO(payload))
+        load_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        model.predict_proba(data)
+        predict_times.append(time.perf_counter() - start)
+
+    metrics = {
+        "트리 수": len(getattr(model, "estimators_", [])),
+        "노드 수": sum(estimator.tree_.node_count for estimator in getattr(model, "estimators_", [])),
+        "크기 (KB)": len(payload) / 1024,
+        "로드 시간 (ms)": np.median(load_times) * 1000,
+        "예측 지연 (ms)": np.median(predict_times) * 1000,
+    }
+    if labels is not None:
+        metrics["정확도"] = (model.predict(data) == labels).mean()
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description="성취 수준 일치율을 유지하면서 RandomForest 모델을 압축합니다.")
+    parser.add_argument("model", help="원본 모델 (.joblib)")
+    parser.add_argument("validation", help="라벨이 포함된 검증 데이터 (.csv)")
+    parser.add_argument("output", help="압축된 모델을 저장할 경로 (.joblib)")
+    parser.add_argument("--label-column", default=None, help="정확도 계산에 사용할 라벨 컬럼")
+    parser.add_argument("--agreement", type=float, default=0.98, help="원본 대비 최소 성취 수준 일치율 (기본값: 0.98)")
+    parser.add_argument("--max-depth", type=int, default=None, help="트리 최대 깊이 제한")
+    args = parser.parse_args()
+
+    model = joblib.load(args.model)
+    validation = pd.read_csv(args.validation, dtype={"학번": str})
+    labels = validation[args.label_column].to_numpy() if args.label_column else None
+    data = prepare_data(validation.copy(), model)
+
+    compacted, agreement = compact_forest(model, data, args.agreement, args.max_depth)
+    joblib.dump(compacted, args.output)
+
+    report = pd.DataFrame({
+        "원본": measure_model(model, data, labels),
+        "압축": measure_model(compacted, data, labels),
+    })
+    print(report.round(3).to_string())
+    print(f"\n성취 수준 일치율: {agreement * 100:.2f}% (목표 {args.agreement * 100:.2f}%)")
+    if agreement < args.agreement:
+        print("목표 일치율을 만족하지 못했습니다. --max-depth 를 늘리거나 목표를 낮춰 보세요.")
+    print(f"압축된 모델을 저장했습니다: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,4 @@
 import streamlit as st
-import pandas as pd
-import joblib
 from io import BytesIO
 
 
@@ -30,17 +28,85 @@ def load_model_and_data():
     """, unsafe_allow_html=True)
 
     st.subheader("AI 모델 및 데이터 불러오기")
-    uploaded_model = st.file_uploader("예측 모델 (.joblib 파일) 업로드", type="joblib")
-    uploaded_data = st.file_uploader("테스트 데이터 (.csv 파일) 업로드", type="csv")
-    if uploaded_model and uploaded_data:
+    from components.snapshots import show_snapshot_restore
+
+    show_snapshot_restore()
+    uploaded_models = st.file_uploader(
+        "예측 모델 (.joblib 파일) 업로드 (여러 개를 올리면 비교)", type="joblib", accept_multiple_files=True
+    )
+    model_file_ids = tuple(uploaded_model.file_id for uploaded_model in uploaded_models)
+    if uploaded_models and st.session_state.get("model_file_ids") != model_file_ids:
+        # joblib/pandas 는 파일이 올라온 뒤에만 필요하므로 첫 화면 렌더링에서 제외
+        import joblib
+        from components.data_preparation import model_hash
+
         try:
-            model = joblib.load(BytesIO(uploaded_model.read()))
-            st.session_state.model = model
-            data = pd.read_csv(uploaded_data, dtype={"학번": str})
-            st.session_state.uploaded_data = data
-            st.success("모델과 데이터가 성공적으로 업로드되었습니다.")
+            models = {}
+            for uploaded_model in uploaded_models:
+                models[uploaded_model.name] = joblib.load(BytesIO(uploaded_model.read()))
+            st.session_state.models = models
+            st.session_state.model_hashes = {name: model_hash(model) for name, model in models.items()}
+            st.session_state.model_file_ids = model_file_ids
+            st.session_state.pop("model_name", None)
         except Exception as e:
-            st.error(f"업로드 중 오류가 발생했습니다: {e}")
-    st.write("*추후 아우누리 학생 DB 연동 필요*")
+            st.error(f"모델 업로드 중 오류가 발생했습니다: {e}")
+
+    models = st.session_state.get("models", {})
+    if models:
+        # 기준 모델의 스코어가 기본 스코어/성취 수준이 되고, 나머지는 비교 컬럼으로 추가됨
+        model_names = list(models)
+        current_index = model_names.index(st.session_state.model_name) if st.session_state.get("model_name") in models else 0
+        model_name = st.selectbox("기준 모델", model_names, index=current_index) if len(models) > 1 else model_names[0]
+        if st.session_state.get("model_name") != model_name:
+            st.session_state.model_name = model_name
+            st.session_state.model = models[model_name]
+            st.session_state.model_hash = st.session_state.model_hashes[model_name]
+            # 모델이 바뀌면 전체 학생을 다시 스코어링
+            st.session_state.pop("processed_data_key", None)
+
+    data_source = st.radio("데이터 소스", ["CSV 파일 업로드", "학생 DB 연동 (SQLite)"], horizontal=True)
+    if data_source == "CSV 파일 업로드":
+        uploaded_data = st.file_uploader("테스트 데이터 (.csv 파일) 업로드", type="csv")
+        # 같은 파일이라도 세션의 데이터가 캐시에서 삭제되었으면 다시 읽음
+        if uploaded_data and (
+            st.session_state.get("data_file_id") != uploaded_data.file_id or "uploaded_data_key" not in st.session_state
+        ):
+            import pandas as pd
+            from components.dataset_store import bytes_hash, clear_session_dataset, get_dataset_store, set_session_dataset
+
+            try:
+                raw_data = uploaded_data.getvalue()
+                data_key = bytes_hash(raw_data)
+                # 같은 파일을 다른 세션이 이미 올렸다면 다시 읽지 않고 공유 저장소의 데이터를 참조
+                data = get_dataset_store().get_or_put(
+                    data_key, lambda: pd.read_csv(BytesIO(raw_data), dtype={"학번": str})
+                )
+                set_session_dataset("uploaded_data", data, data_key)
+                st.session_state.data_file_id = uploaded_data.file_id
+                clear_session_dataset("processed_data")
+                st.session_state.pop("pending_score_ids", None)
+                st.session_state.pop("db_sync", None)
+            except Exception as e:
+                st.error(f"데이터 업로드 중 오류가 발생했습니다: {e}")
+    else:
+        from components.student_db import show_student_db_sync
+
+        show_student_db_sync()
+
+    if "model" in st.session_state and "uploaded_data_key" in st.session_state:
+        from components.dataset_store import show_store_status
+
+        st.success("모델과 데이터가 성공적으로 업로드되었습니다.")
+        show_store_status()
+
+        from components.dataset_store import session_dataset
+        from components.feature_sketches import show_drift_check
+
+        show_drift_check(session_dataset("uploaded_data"), st.session_state.model)
+
+        # 다른 페이지를 처음 열 때 기다리지 않도록 스코어링/집계를 백그라운드에서 미리 계산
+        from components.precompute import start_precompute
+
+        start_precompute()
 
             
@@ -0,0 +1,188 @@
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from components.data_preparation import SUCCESS_CLASS_INDEX, assign_tiers, predict_success, prepare_data
+
+# 다른 학내 시스템(상담 포털, 경력개발센터 CRM 등)용 로컬 HTTP/JSON 스코어링 서비스
+DEFAULT_PORT = 8502
+STATS_WINDOW = 10000  # 지연 시간 통계에 사용할 최근 요청 수
+
+
+class MicroBatcher:
+    """
+    동시에 들어온 단건 요청을 max_wait_ms 동안 모아 한 번의 predict_proba 로 처리.
+    """
+
+    def __init__(self, model, max_batch_size=64, max_wait_ms=5.0):
+        self.model = model
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=STATS_WINDOW)
+        self._completed = deque(maxlen=STATS_WINDOW)  # 완료 시각 (처리량 계산용)
+        self._batch_sizes = deque(maxlen=STATS_WINDOW)
+        self.total_requests = 0
+        self.total_batches = 0
+        self._worker = threading.Thread(target=self._run, daemon=True)
+        self._worker.start()
+
+    def submit(self, record):
+        future = Future()
+        self._queue.put((record, future, time.perf_counter()))
+        return future
+
+    def score(self, record, timeout=30):
+        return self.submit(record).result(timeout)
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, records):
+        data = pd.DataFrame(records)
+        probabilities = predict_success(self.model, prepare_data(data.copy(), self.model))
+        scores = probabilities[:, SUCCESS_CLASS_INDEX]
+        return [
+            {"학번": record.get("학번"), "score": float(score), "성취 수준": tier}
+            for record, score, tier in zip(records, scores, assign_tiers(scores))
+        ]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            try:
+                outcomes = [(True, result) for result in self._score([record for record, _, _ in batch])]
+            except Exception:
+                # 잘못된 요청 하나 때문에 같은 배치의 다른 요청까지 실패하지 않도록 한 건씩 다시 스코어링
+                outcomes = []
+                for record, _, _ in batch:
+                    try:
+                        outcomes.append((True, self._score([record])[0]))
+                    except Exception as e:
+                        outcomes.append((False, e))
+
+            finished = time.perf_counter()
+            completed = []
+            for (_, future, submitted), (ok, outcome) in zip(batch, outcomes):
+                if ok:
+                    future.set_result(outcome)
+                    completed.append(submitted)
+                else:
+                    future.set_exception(outcome)
+            with self._lock:
+                self._latencies.extend(finished - submitted for submitted in completed)
+                self._completed.extend([finished] * len(completed))
+                self._batch_sizes.append(len(batch))
+                self.total_requests += len(completed)
+                self.total_batches += 1
+
+    def stats(self):
+        with self._lock:
+            latencies = np.array(self._latencies) * 1000
+            completed = list(self._completed)
+            batch_sizes = list(self._batch_sizes)
+            total_requests, total_batches = self.total_requests, self.total_batches
+
+        window = completed[-1] - completed[0] if len(completed) > 1 else 0.0
+        return {
+            "requests": total_requests,
+            "batches": total_batches,
+            "mean_batch_size": float(np.mean(batch_sizes)) if batch_sizes else 0.0,
+            "p50_ms": float(np.percentile(latencies, 50)) if len(latencies) else None,
+            "p99_ms": float(np.percentile(latencies, 99)) if len(latencies) else None,
+            "throughput_rps": (len(completed) - 1) / window if window > 0 else None,
+        }
+
+
+def make_handler(batcher):
+    class ScoringHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive 로 연결 재사용
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send_json(200, {"status": "ok"})
+            elif self.path == "/stats":
+                self._send_json(200, batcher.stats())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            if self.path != "/score":
+                self._send_json(404, {"error": "not found"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length) or b"{}")
+                # 단건(객체)과 여러 건(배열) 모두 지원, 각 학생은 배치에 개별로 합류
+                records = payload if isinstance(payload, list) else [payload]
+                futures = [batcher.submit(record) for record in records]
+                results = [future.result(timeout=30) for future in futures]
+                self._send_json(200, results if isinstance(payload, list) else results[0])
+            except Exception as e:
+                self._send_json(400, {"error": str(e)})
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScoringHandler
+
+
+class ScoringServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 128  # 동시 접속이 몰려도 연결이 거부되지 않도록 대기열을 늘림
+
+
+def create_server(model, host="127.0.0.1", port=DEFAULT_PORT, max_batch_size=64, max_wait_ms=5.0):
+    batcher = MicroBatcher(model, max_batch_size, max_wait_ms)
+    server = ScoringServer((host, port), make_handler(batcher))
+    server.batcher = batcher
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="취업 성공 스코어 로컬 HTTP 서비스")
+    parser.add_argument("--model", default="job_success_weighted_model_final.joblib", help="예측 모델 (.joblib)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-batch", type=int, default=64, help="마이크로 배치 최대 크기")
+    parser.add_argument("--max-wait-ms", type=float, default=5.0, help="배치를 모으는 최대 대기 시간 (ms)")
+    args = parser.parse_args()
+
+    server = create_server(joblib.load(args.model), args.host, args.port, args.max_batch, args.max_wait_ms)
+    print(f"스코어링 서비스 시작: http://{args.host}:{server.server_address[1]} (POST /score, GET /stats)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
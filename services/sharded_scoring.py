@@ -0,0 +1,421 @@
+import argparse
+import json
+import os
+import shutil
+import socket
+import sqlite3
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from components.arrow_files import read_table, write_dataframe, write_table
+from components.data_preparation import SCORE_COLUMN, TIER_CUT_POINTS, TIER_LABELS, score_data
+from components.export import export_rows
+
+# 전교 단위 스코어링: 학생 데이터를 샤드로 나눠 로컬 작업 큐(SQLite 파일)에 넣고,
+# 공유 디렉터리를 보는 작업 프로세스들(다른 서버 포함)이 샤드를 가져가 스코어링한 뒤 코디네이터가 합침
+# 큐 디렉터리 구조: queue.sqlite, runs/{run_id}/model.joblib, shards/*.arrow (입력), results/*.arrow (결과)
+QUEUE_DB_NAME = "queue.sqlite"
+DEFAULT_SHARD_ROWS = 20_000
+LEASE_SECONDS = 120  # 이 시간 동안 하트비트가 없으면 작업 프로세스가 죽은 것으로 보고 다른 프로세스가 가져감
+MAX_ATTEMPTS = 3
+HISTOGRAM_BINS = np.linspace(0, 100, 21)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    cut_points TEXT NOT NULL,
+    n_shards INTEGER NOT NULL,
+    n_rows INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS shards (
+    run_id TEXT NOT NULL,
+    shard_id INTEGER NOT NULL,
+    label TEXT NOT NULL,
+    n_rows INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'queued',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    heartbeat REAL,
+    seconds REAL,
+    aggregates TEXT,
+    error TEXT,
+    PRIMARY KEY (run_id, shard_id)
+);
+CREATE INDEX IF NOT EXISTS shards_status ON shards (status, run_id, shard_id);
+"""
+
+
+class ShardQueue:
+    """
+    SQLite 파일 하나로 만든 샤드 작업 큐. 가져가기(claim)는 쓰기 잠금(BEGIN IMMEDIATE) 안에서 처리해
+    여러 프로세스가 같은 샤드를 동시에 가져가지 않음.
+    """
+
+    def __init__(self, root, lease_seconds=LEASE_SECONDS, max_attempts=MAX_ATTEMPTS):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        conn = self._connect()
+        try:
+            conn.executescript(SCHEMA)
+        finally:
+            conn.close()
+
+    def run_dir(self, run_id):
+        return self.root / "runs" / run_id
+
+    def _connect(self):
+        # 공유 디렉터리(네트워크 파일 시스템)에서도 쓸 수 있도록 WAL 대신 기본 저널 모드 사용
+        return sqlite3.connect(self.root / QUEUE_DB_NAME, timeout=60, isolation_level=None)
+
+    @contextmanager
+    def _transaction(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+    def create_run(self, model_path, shards, cut_points=TIER_CUT_POINTS):
+        """
+        모델과 샤드 입력 파일을 큐 디렉터리에 쓰고 샤드 작업을 등록. shards 는 (이름, 데이터프레임) 목록.
+        """
+        run_id = time.strftime("%Y%m%d-%H%M%S-") + uuid.uuid4().hex[:6]
+        run_dir = self.run_dir(run_id)
+        (run_dir / "shards").mkdir(parents=True)
+        (run_dir / "results").mkdir()
+        shutil.copyfile(model_path, run_dir / "model.joblib")
+        rows = []
+        for shard_id, (label, shard) in enumerate(shards):
+            write_dataframe(shard, run_dir / "shards" / f"{shard_id:05d}.arrow")
+            rows.append((run_id, shard_id, str(label), len(shard)))
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO runs VALUES (?, ?, ?, ?, ?)",
+                (run_id, time.time(), json.dumps(list(cut_points)), len(rows), sum(row[3] for row in rows)),
+            )
+            conn.executemany("INSERT INTO shards (run_id, shard_id, label, n_rows) VALUES (?, ?, ?, ?)", rows)
+        return run_id
+
+    def claim(self, worker):
+        """
+        대기 중이거나 임대 시간이 지난 샤드 하나를 가져감. 없으면 None.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            # 재시도 횟수를 다 쓴 채로 임대가 끝난 샤드는 실패로 확정
+            conn.execute(
+                "UPDATE shards SET status = 'failed', error = COALESCE(error, '임대 시간 초과') "
+                "WHERE status = 'running' AND heartbeat < ? AND attempts >= ?",
+                (now - self.lease_seconds, self.max_attempts),
+            )
+            row = conn.execute(
+                "SELECT shards.run_id, shard_id, cut_points FROM shards JOIN runs USING (run_id) "
+                "WHERE status = 'queued' OR (status = 'running' AND heartbeat < ?) "
+                "ORDER BY runs.created_at, shard_id LIMIT 1",
+                (now - self.lease_seconds,),
+            ).fetchone()
+            if row is None:
+                return None
+            run_id, shard_id, cut_points = row
+            conn.execute(
+                "UPDATE shards SET status = 'running', attempts = attempts + 1, worker = ?, heartbeat = ? "
+                "WHERE run_id = ? AND shard_id = ?",
+                (worker, now, run_id, shard_id),
+            )
+        return run_id, shard_id, tuple(json.loads(cut_points))
+
+    def heartbeat(self, run_id, shard_id, worker):
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE shards SET heartbeat = ? WHERE run_id = ? AND shard_id = ? AND worker = ? AND status = 'running'",
+                (time.time(), run_id, shard_id, worker),
+            )
+
+    def complete(self, run_id, shard_id, worker, seconds, aggregates):
+        # 임대가 끝나 다른 프로세스가 가져간 샤드면 기록하지 않음 (결과 파일은 같은 내용으로 덮어써짐)
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE shards SET status = 'done', seconds = ?, aggregates = ?, error = NULL "
+                "WHERE run_id = ? AND shard_id = ? AND worker = ? AND status = 'running'",
+                (seconds, json.dumps(aggregates, ensure_ascii=False), run_id, shard_id, worker),
+            )
+
+    def fail(self, run_id, shard_id, worker, error):
+        # 재시도 횟수가 남아 있으면 다시 대기열로
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE shards SET status = CASE WHEN attempts < ? THEN 'queued' ELSE 'failed' END, error = ? "
+                "WHERE run_id = ? AND shard_id = ? AND worker = ? AND status = 'running'",
+                (self.max_attempts, error, run_id, shard_id, worker),
+            )
+
+    def _query(self, sql, params):
+        # 조회는 쓰기 잠금 없이
+        conn = self._connect()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def progress(self, run_id):
+        counts = dict(self._query("SELECT status, COUNT(*) FROM shards WHERE run_id = ? GROUP BY status", (run_id,)))
+        return {status: counts.get(status, 0) for status in ("queued", "running", "done", "failed")}
+
+    def shard_rows(self, run_id):
+        return self._query(
+            "SELECT shard_id, label, n_rows, status, attempts, worker, seconds, aggregates, error "
+            "FROM shards WHERE run_id = ? ORDER BY shard_id", (run_id,)
+        )
+
+
+def make_shards(data, by_major=False, shard_rows=DEFAULT_SHARD_ROWS):
+    """
+    (이름, 데이터프레임) 샤드 목록. by_major 면 전공별로 나눈 뒤 큰 전공은 다시 shard_rows 행씩 나눔.
+    """
+    groups = data.groupby("전공", sort=True, dropna=False) if by_major else [("전체", data)]
+    shards = []
+    for label, group in groups:
+        for start in range(0, len(group), shard_rows):
+            shards.append((f"{label}:{start}", group.iloc[start:start + shard_rows]))
+    return shards
+
+
+def shard_aggregates(scored):
+    """
+    코디네이터가 더하기만 하면 되는 샤드별 집계 (행 수, 스코어 합/제곱합, 히스토그램, 전공별 성취 수준 수).
+    """
+    scores = scored[SCORE_COLUMN].to_numpy(dtype=np.float64)
+    tier_counts = scored.groupby(["전공", "성취 수준"], observed=True, dropna=False).size()
+    by_major = {}
+    for (major, tier), count in tier_counts.items():
+        by_major.setdefault(str(major), {})[str(tier)] = int(count)
+    return {
+        "rows": int(len(scored)),
+        "score_sum": float(np.nansum(scores)),
+        "score_sumsq": float(np.nansum(scores ** 2)),
+        "histogram": np.histogram(scores[~np.isnan(scores)], bins=HISTOGRAM_BINS)[0].tolist(),
+        "by_major": by_major,
+        "uncertain": int(scored["성취 수준 불확실"].sum()) if "성취 수준 불확실" in scored.columns else None,
+    }
+
+
+def merge_aggregates(parts):
+    merged = {"rows": 0, "score_sum": 0.0, "score_sumsq": 0.0, "histogram": [0] * (len(HISTOGRAM_BINS) - 1),
+              "by_major": {}, "uncertain": None}
+    for part in parts:
+        merged["rows"] += part["rows"]
+        merged["score_sum"] += part["score_sum"]
+        merged["score_sumsq"] += part["score_sumsq"]
+        merged["histogram"] = [a + b for a, b in zip(merged["histogram"], part["histogram"])]
+        for major, tiers in part["by_major"].items():
+            major_counts = merged["by_major"].setdefault(major, {})
+            for tier, count in tiers.items():
+                major_counts[tier] = major_counts.get(tier, 0) + count
+        if part["uncertain"] is not None:
+            merged["uncertain"] = (merged["uncertain"] or 0) + part["uncertain"]
+    rows = max(merged["rows"], 1)
+    merged["score_mean"] = merged["score_sum"] / rows
+    merged["score_std"] = float(np.sqrt(max(merged["score_sumsq"] / rows - merged["score_mean"] ** 2, 0.0)))
+    merged["tiers"] = {
+        tier: sum(tiers.get(tier, 0) for tiers in merged["by_major"].values()) for tier in TIER_LABELS
+    }
+    return merged
+
+
+class _Heartbeat:
+    # 샤드를 처리하는 동안 임대를 주기적으로 연장
+    def __init__(self, queue, run_id, shard_id, worker):
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run, args=(queue, run_id, shard_id, worker), daemon=True
+        )
+
+    def _run(self, queue, run_id, shard_id, worker):
+        while not self._stop.wait(queue.lease_seconds / 3):
+            queue.heartbeat(run_id, shard_id, worker)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def process_shard(queue, run_id, shard_id, cut_points, worker, models):
+    import joblib
+
+    run_dir = queue.run_dir(run_id)
+    if run_id not in models:
+        models.clear()  # 작업 프로세스는 한 번에 한 실행의 모델만 보관
+        models[run_id] = joblib.load(run_dir / "model.joblib")
+    start = time.perf_counter()
+    with _Heartbeat(queue, run_id, shard_id, worker):
+        shard = read_table(run_dir / "shards" / f"{shard_id:05d}.arrow").to_pandas()
+        # score_data 안에서 prepare_data -> predict_success -> 성취 수준 구간화 (앱과 같은 결과)
+        scored = score_data(shard, models[run_id], cut_points=cut_points)
+        write_dataframe(scored, run_dir / "results" / f"{shard_id:05d}.arrow")
+        aggregates = shard_aggregates(scored)
+    queue.complete(run_id, shard_id, worker, time.perf_counter() - start, aggregates)
+
+
+def run_worker(root, worker=None, idle_exit=None, poll_interval=0.5, lease_seconds=LEASE_SECONDS):
+    """
+    큐가 빌 때까지(idle_exit 초 동안 샤드가 없으면 종료, None 이면 계속 대기) 샤드를 가져가 처리.
+    """
+    queue = ShardQueue(root, lease_seconds=lease_seconds)
+    worker = worker or f"{socket.gethostname()}-{os.getpid()}"
+    models, processed, idle_since = {}, 0, time.monotonic()
+    while True:
+        claimed = queue.claim(worker)
+        if claimed is None:
+            if idle_exit is not None and time.monotonic() - idle_since >= idle_exit:
+                return processed
+            time.sleep(poll_interval)
+            continue
+        run_id, shard_id, cut_points = claimed
+        try:
+            process_shard(queue, run_id, shard_id, cut_points, worker, models)
+            processed += 1
+        except Exception as e:
+            queue.fail(run_id, shard_id, worker, repr(e))
+            print(f"[{worker}] 샤드 {run_id}/{shard_id} 실패: {e!r}", file=sys.stderr)
+        idle_since = time.monotonic()
+
+
+def wait_for_run(queue, run_id, poll_interval=0.5, progress=None):
+    while True:
+        counts = queue.progress(run_id)
+        if progress:
+            progress(counts)
+        if counts["queued"] == 0 and counts["running"] == 0:
+            return counts
+        time.sleep(poll_interval)
+
+
+def merge_run(queue, run_id, output=None):
+    """
+    완료된 샤드의 결과를 샤드 순서대로 합쳐 output(.arrow/.csv)에 쓰고, 샤드별 집계를 합친 요약을 반환.
+    """
+    import pyarrow as pa
+
+    shard_rows = queue.shard_rows(run_id)
+    failed = [(shard_id, label, error) for shard_id, label, _, status, _, _, _, _, error in shard_rows
+              if status != "done"]
+    if failed:
+        raise RuntimeError(f"완료되지 않은 샤드가 있습니다: {failed[:5]}")
+    summary = merge_aggregates([json.loads(row[7]) for row in shard_rows])
+    summary["shards"] = len(shard_rows)
+    summary["shard_seconds"] = sum(row[6] for row in shard_rows)
+    summary["retried_shards"] = sum(row[4] > 1 for row in shard_rows)
+    if output:
+        output = Path(output)
+        results = queue.run_dir(run_id) / "results"
+        # 샤드마다 결측 컬럼의 타입이 다를 수 있으므로(예: 전부 결측이면 null) 공통 타입으로 맞춰 합침
+        table = pa.concat_tables(
+            [read_table(results / f"{row[0]:05d}.arrow") for row in shard_rows], promote_options="default"
+        )
+        if output.suffix == ".csv":
+            merged = table.to_pandas()
+            export_rows(merged, np.arange(len(merged)), list(merged.columns), "csv", output)
+        else:
+            write_table(table, output)
+    (queue.run_dir(run_id) / "summary.json").write_text(json.dumps(summary, ensure_ascii=False, indent=2))
+    return summary
+
+
+def submit(root, model_path, data_path, by_major=False, shard_rows=DEFAULT_SHARD_ROWS, cut_points=TIER_CUT_POINTS):
+    data = pd.read_csv(data_path, dtype={"학번": str})
+    return ShardQueue(root).create_run(model_path, make_shards(data, by_major, shard_rows), cut_points)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 단위 다중 작업 프로세스 스코어링 (로컬 SQLite 작업 큐)")
+    parser.add_argument("--queue", default=".cache/shard_queue", help="큐 디렉터리 (여러 서버면 공유 디렉터리)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    submit_parser = commands.add_parser("submit", help="학생 데이터를 샤드로 나눠 큐에 등록")
+    run_parser = commands.add_parser("run", help="등록 + 로컬 작업 프로세스 N개 실행 + 병합을 한 번에")
+    for command in (submit_parser, run_parser):
+        command.add_argument("--model", default="job_success_weighted_model_final.joblib", help="예측 모델 (.joblib)")
+        command.add_argument("--data", required=True, help="학생 데이터 (.csv)")
+        command.add_argument("--by-major", action="store_true", help="전공별로 샤드를 나눔 (큰 전공은 다시 나눔)")
+        command.add_argument("--shard-rows", type=int, default=DEFAULT_SHARD_ROWS, help="샤드당 최대 행 수")
+        command.add_argument("--tier-cuts", type=float, nargs=2, default=TIER_CUT_POINTS,
+                             help="중성취/고성취 시작 스코어")
+    run_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="로컬 작업 프로세스 수")
+    run_parser.add_argument("--output", default=None, help="병합 결과 파일 (.arrow 또는 .csv)")
+
+    worker_parser = commands.add_parser("worker", help="샤드를 가져가 스코어링하는 작업 프로세스")
+    worker_parser.add_argument("--idle-exit", type=float, default=None, help="이 시간(초) 동안 샤드가 없으면 종료")
+
+    merge_parser = commands.add_parser("merge", help="실행의 샤드 결과와 집계를 병합")
+    merge_parser.add_argument("--run", required=True, help="실행 ID")
+    merge_parser.add_argument("--output", default=None, help="병합 결과 파일 (.arrow 또는 .csv)")
+    merge_parser.add_argument("--wait", action="store_true", help="모든 샤드가 끝날 때까지 기다린 뒤 병합")
+    args = parser.parse_args()
+
+    if args.command == "worker":
+        processed = run_worker(args.queue, idle_exit=args.idle_exit)
+        print(f"처리한 샤드: {processed}")
+        return
+
+    if args.command in ("submit", "run"):
+        start = time.perf_counter()
+        run_id = submit(args.queue, args.model, args.data, args.by_major, args.shard_rows, tuple(args.tier_cuts))
+        print(f"실행 ID: {run_id} ({time.perf_counter() - start:.1f}s)")
+        if args.command == "submit":
+            return
+        start = time.perf_counter()
+        workers = [
+            subprocess.Popen([sys.executable, "-m", "services.sharded_scoring", "--queue", args.queue, "worker"])
+            for _ in range(args.workers)
+        ]
+        queue = ShardQueue(args.queue)
+        try:
+            while True:
+                counts = queue.progress(run_id)
+                if counts["queued"] == 0 and counts["running"] == 0:
+                    break
+                if all(worker.poll() is not None for worker in workers):
+                    raise SystemExit("작업 프로세스가 모두 종료되었습니다.")
+                time.sleep(0.2)
+        finally:
+            for worker in workers:
+                worker.terminate()
+            for worker in workers:
+                worker.wait()
+        elapsed = time.perf_counter() - start
+        summary = merge_run(queue, run_id, args.output)
+        print(f"작업 프로세스 {args.workers}개: {summary['rows']:,}행 {elapsed:.1f}s ({summary['rows'] / elapsed:,.0f} 행/s), "
+              f"샤드 {counts['done']}개 완료, 재시도 {summary['retried_shards']}개")
+    else:
+        queue = ShardQueue(args.queue)
+        if args.wait:
+            wait_for_run(queue, args.run)
+        summary = merge_run(queue, args.run, args.output)
+
+    print(f"평균 스코어 {summary['score_mean']:.2f} (표준편차 {summary['score_std']:.2f}), "
+          f"성취 수준 {summary['tiers']}, 불확실 {summary['uncertain']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,7 @@
 import streamlit as st
-from components.filters import show_filters
-from components.visualizations import (
-    create_colored_table,
-    plot_feature_distribution_with_groups,
-    show_pie_chart,
-)
-from components.data_preparation import prepare_data, predict_success, categorize_performance
-from components.recommendations import show_improvement_suggestions
-from models.model_loader import load_model_and_data
-import plotly.graph_objects as go
+
+# 페이지별 모듈(pandas, plotly 등)은 해당 페이지를 처음 열 때만 import (콜드 스타트 단축)
+
 # 페이지 설정
 st.set_page_config(
     page_title="취업 성공 예측 모델",
@@ -18,17 +11,32 @@ st.set_page_config(
 
 st.title(":briefcase: 취업 성공 예측 모듈")
 page_selection = st.sidebar.radio("페이지 선택", ["모델/데이터 불러오기", "취업 성취 스코어", "그룹별 특성 상세 보기", "개인별 상세 분석"])
+if "precompute_owner" in st.session_state:
+    from components.precompute import show_precompute_status
+
+    show_precompute_status()
 
 # -------------------------------------------------------------------------
 if page_selection == "모델/데이터 불러오기":
+    from models.model_loader import load_model_and_data
+
     load_model_and_data()
 
 elif page_selection == "취업 성취 스코어":
+    from components.filters import show_filters
+
     show_filters()
 
 elif page_selection == "그룹별 특성 상세 보기":
-    if "processed_data" in st.session_state:
-        data = st.session_state["processed_data"].copy()
+    from components.dataset_store import session_dataset
+
+    processed_data = session_dataset("processed_data")
+    if processed_data is not None:
+        import plotly.graph_objects as go
+        from components.group_distributions import get_group_distributions
+        from components.visualizations import plot_feature_distribution_with_groups
+
+        data = processed_data
 
         # 분석 가능한 특성 정의
         available_features = ["성적수준", "교류수준", "역량수준", "일경험수준", "비교과수준"]
@@ -88,24 +96,15 @@ elif page_selection == "그룹별 특성 상세 보기":
         # 데이터 분포 시각화
         st.subheader("성취 그룹별 데이터 분포 비교")
 
-        # 전공 매핑
-        major_mapping = {
-            1: "기계공학부", 2: "메카트로닉스공학부", 3: "전기전자통신공학부",
-            4: "컴퓨터공학부", 5: "에너지신소재화학공학부", 6: "산업경영학부", 7: "디자인건축공학부"
-        }
-
         # 성취 수준별로 그룹화된 데이터 확인
         if "성취 수준" in data.columns:
-            selected_feature = st.selectbox(
-                "분포를 확인할 특성:",
-                [col for col in data.columns if col not in ["학번", "이름", "성취 수준", "취업 성공 가능 스코어 (%)"]]
-            )
+            # 특성별 분포는 데이터셋마다 한 번만 계산되어 있으므로 여기서는 조회만 함
+            group_distributions = get_group_distributions(st.session_state.processed_data_key, data)
+            selected_feature = st.selectbox("분포를 확인할 특성:", list(group_distributions))
 
-            if selected_feature in data.columns:
+            if selected_feature in group_distributions:
                 try:
-                    # 그룹별로 선택한 특성의 분포 계산
-                    grouped_data = data.groupby("성취 수준")[selected_feature].value_counts(normalize=True).unstack(fill_value=0)
-                    data['전공'] = data['전공'].map(major_mapping)
+                    grouped_data = group_distributions[selected_feature]
 
                     # Plotly 데이터 준비
                     fig = go.Figure()
@@ -147,11 +146,39 @@ elif page_selection == "그룹별 특성 상세 보기":
         else:
             st.warning("데이터에 '성취 수준' 컬럼이 없습니다. 먼저 데이터를 처리하세요.")
 
+        # 업로드한 학생 데이터 기준 순열 중요도 (스코어링 후 백그라운드에서 계산)
+        from components.permutation_importance import permutation_importance_status
+
+        st.markdown("---")
+        st.subheader("업로드 데이터 기준 특성 중요도")
+        importance_status, importance = permutation_importance_status(
+            st.session_state.get("model_hash"), st.session_state.get("uploaded_data_key")
+        )
+        if importance is not None:
+            top_importance = importance.head(15).iloc[::-1]
+            importance_fig = go.Figure(go.Bar(
+                x=top_importance["중요도"], y=top_importance["특성"], orientation="h",
+                error_x=dict(type="data", array=top_importance["표준편차"]),
+            ))
+            importance_fig.update_layout(
+                xaxis=dict(title="특성을 섞었을 때 평균 스코어 변화 (%p)"), template="plotly_white", height=500
+            )
+            st.plotly_chart(importance_fig, use_container_width=True)
+        elif importance_status == "running":
+            st.info("특성 중요도를 계산하는 중입니다. 잠시 후 페이지를 다시 열면 표시됩니다.")
+        else:
+            st.info("'취업 성취 스코어' 페이지에서 스코어링하면 특성 중요도 계산이 시작됩니다.")
+
 
         # 텍스트 설명 추가
         
     else:
-        st.warning("먼저 '취업 성취 스코어' 페이지에서 데이터를 처리하세요.")
+        from components.dataset_store import show_expired_warning
+
+        if not show_expired_warning():
+            st.warning("먼저 '취업 성취 스코어' 페이지에서 데이터를 처리하세요.")
 
 elif page_selection == "개인별 상세 분석":
+    from components.recommendations import show_improvement_suggestions
+
     show_improvement_suggestions()
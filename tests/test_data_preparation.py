@@ -0,0 +1,17 @@
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import GradientBoostingClassifier
+
+from components.data_preparation import model_hash
+
+
+def test_model_hash_boosting():
+    # 부스팅 모델의 estimators_ 는 ndarray 이므로 트리별로 펼쳐서 해시해야 함
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame(rng.normal(size=(200, 3)), columns=["a", "b", "c"])
+    target = (features["a"] > 0).astype(int)
+    model = GradientBoostingClassifier(n_estimators=5, random_state=0).fit(features, target)
+    other = GradientBoostingClassifier(n_estimators=5, random_state=0, max_depth=2).fit(features, target)
+
+    assert model_hash(model) == model_hash(model)
+    assert model_hash(model) != model_hash(other)
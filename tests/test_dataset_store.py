@@ -0,0 +1,41 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from components.dataset_store import DatasetStore
+
+
+def frame(offset):
+    return pd.DataFrame({"x": np.arange(10_000) + offset})
+
+
+def test_spilled_files_stay_within_budget(tmp_path):
+    # 메모리에서 내린 데이터셋 파일이 한도를 넘으면 가장 오래 쓰지 않은 파일부터 삭제
+    nbytes = int(frame(0).memory_usage(deep=True).sum())
+    store = DatasetStore(byte_budget=nbytes, spill_dir=tmp_path, spill_budget=int(nbytes * 3.5))
+    keys = []
+    for offset in range(5):
+        keys.append(store.put(frame(offset)))
+        spilled = sorted(tmp_path.glob("*.pkl"), key=os.path.getmtime)
+        for age, path in enumerate(spilled):
+            os.utime(path, (age, age))
+
+    spilled = {path.stem for path in tmp_path.glob("*.pkl")}
+    assert sum(path.stat().st_size for path in tmp_path.glob("*.pkl")) <= nbytes * 3.5
+    assert spilled == set(keys[1:4])
+    # 삭제된 데이터셋은 저장소에 없는 것으로 보여 세션이 만료 상태로 안내할 수 있어야 함
+    assert keys[0] not in store
+    assert store.get(keys[0]) is None
+    assert store.get(keys[3])["x"].iloc[0] == 3
+
+
+def test_leftover_spills_are_pruned_on_start(tmp_path):
+    for offset in range(3):
+        frame(offset).to_pickle(tmp_path / f"old{offset}.pkl")
+        os.utime(tmp_path / f"old{offset}.pkl", (offset, offset))
+    size = (tmp_path / "old0.pkl").stat().st_size
+
+    DatasetStore(spill_dir=tmp_path, spill_budget=size)
+
+    assert [path.name for path in tmp_path.glob("*.pkl")] == ["old2.pkl"]
@@ -0,0 +1,18 @@
+import numpy as np
+import pandas as pd
+
+from components.pagination import build_sort_index, ordered_positions
+
+
+def test_descending_keeps_missing_values_last():
+    # 내림차순으로 바꿔도 결측값(학년 없음)은 기존 sort_values 처럼 맨 뒤에 남아야 함
+    data = pd.DataFrame({"학번": list("abcdef"), "학년": [2, np.nan, 1, 3, np.nan, 4]})
+    sort_index = build_sort_index(data)
+    mask = np.array([True, True, True, True, True, False])
+
+    ascending = ordered_positions(data, sort_index, "학년", mask)
+    descending = ordered_positions(data, sort_index, "학년", mask, ascending=False)
+
+    assert data["학년"].iloc[ascending].tolist()[:3] == [1, 2, 3]
+    assert data["학년"].iloc[descending].tolist()[:3] == [3, 2, 1]
+    assert data["학년"].iloc[descending].isna().tolist() == [False, False, False, True, True]
@@ -0,0 +1,28 @@
+from datetime import datetime
+
+import pandas as pd
+
+from components import score_history
+
+
+def scored(tiers, ids=None):
+    ids = ids or [str(i) for i in range(len(tiers))]
+    return pd.DataFrame({
+        "학번": ids, "전공": "컴퓨터공학", "취업 성공 가능 스코어 (%)": 50.0, "성취 수준": tiers,
+    })
+
+
+def test_tier_drops_compare_latest_runs(tmp_path, monkeypatch):
+    # 변경된 학생만 다시 스코어링한 경우에도 합친 전체 결과가 기록되므로 직전 실행과 비교됨
+    monkeypatch.setattr(score_history, "history_root", lambda: tmp_path)
+    score_history.append_run(scored(["고성취", "고성취", "중성취"]), "m", datetime(2026, 1, 1))
+    score_history.append_run(scored(["고성취", "중성취", "중성취"]), "m", datetime(2026, 1, 2))
+    score_history.append_run(scored(["고성취", "고성취", "중성취"]), "other", datetime(2026, 1, 3))
+
+    dropped = score_history.tier_drops("m")
+    assert dropped["학번"].tolist() == ["1"]
+    assert dropped["이전 성취 수준"].tolist() == ["고성취"]
+    mix = score_history.tier_mix_by_major("m")
+    assert sorted(mix["run_at"].dt.day.unique()) == [1, 2]
+    assert len(score_history.list_runs("m")) == 2
+    assert len(score_history.student_trajectory("1")) == 3
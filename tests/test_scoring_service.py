@@ -0,0 +1,29 @@
+import numpy as np
+import pandas as pd
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from services.scoring_service import MicroBatcher
+
+
+def make_model():
+    rng = np.random.default_rng(0)
+    features = pd.DataFrame({"학점": rng.uniform(0, 4.5, 200), "인턴 횟수": rng.integers(0, 4, 200)})
+    labels = (features["학점"] + features["인턴 횟수"] > 4).astype(int)
+    return RandomForestClassifier(n_estimators=10, random_state=0).fit(features, labels)
+
+
+def test_bad_record_fails_alone():
+    # 배치 안에 잘못된 요청이 있어도 그 요청만 실패하고 나머지는 정상 스코어를 받아야 함
+    batcher = MicroBatcher(make_model(), max_wait_ms=200)
+    records = [{"학번": str(i), "학점": 1.0 + i, "인턴 횟수": i} for i in range(4)]
+    bad = {"학번": "bad", "학점": "abc", "인턴 횟수": 1}
+
+    futures = [batcher.submit(record) for record in records[:2] + [bad] + records[2:]]
+
+    with pytest.raises(ValueError):
+        futures[2].result(10)
+    results = [future.result(10) for future in futures[:2] + futures[3:]]
+    expected = batcher._score(records)
+    assert results == expected
+    assert batcher.stats()["requests"] == len(records)
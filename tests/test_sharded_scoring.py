@@ -0,0 +1,58 @@
+import time
+
+import pandas as pd
+
+from services.sharded_scoring import MAX_ATTEMPTS, ShardQueue
+
+LEASE_SECONDS = 0.2
+
+
+def shard_state(queue, run_id, shard_id):
+    row = next(row for row in queue.shard_rows(run_id) if row[0] == shard_id)
+    return {"status": row[3], "attempts": row[4], "worker": row[5], "error": row[8]}
+
+
+def test_expired_lease_retry_and_failure(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    model_path.write_bytes(b"model")
+    queue = ShardQueue(tmp_path / "queue", lease_seconds=LEASE_SECONDS)
+    run_id = queue.create_run(model_path, [("a", pd.DataFrame({"학번": ["1"]}))])
+
+    # 임대 중인 샤드는 다른 작업 프로세스가 가져가지 못함
+    assert queue.claim("w1")[:2] == (run_id, 0)
+    assert queue.claim("w2") is None
+
+    # 하트비트 없이 임대 시간이 지나면 다른 작업 프로세스가 다시 가져가고, 이전 작업 프로세스의 완료 기록은 무시됨
+    time.sleep(LEASE_SECONDS * 1.5)
+    assert queue.claim("w2")[:2] == (run_id, 0)
+    queue.complete(run_id, 0, "w1", 1.0, {})
+    assert shard_state(queue, run_id, 0) == {"status": "running", "attempts": 2, "worker": "w2", "error": None}
+
+    # 재시도 횟수가 남아 있으면 실패한 샤드는 다시 대기열로
+    queue.fail(run_id, 0, "w2", "boom")
+    assert shard_state(queue, run_id, 0)["status"] == "queued"
+
+    # 마지막 시도에서 실패하면 실패로 확정되어 더 이상 가져가지 않음
+    for attempt in range(3, MAX_ATTEMPTS + 1):
+        assert queue.claim(f"w{attempt}")[:2] == (run_id, 0)
+        queue.fail(run_id, 0, f"w{attempt}", "boom")
+    assert shard_state(queue, run_id, 0)["status"] == "failed"
+    assert shard_state(queue, run_id, 0)["attempts"] == MAX_ATTEMPTS
+    assert queue.claim("w9") is None
+
+
+def test_expired_lease_on_last_attempt_fails(tmp_path):
+    model_path = tmp_path / "model.joblib"
+    model_path.write_bytes(b"model")
+    queue = ShardQueue(tmp_path / "queue", lease_seconds=LEASE_SECONDS, max_attempts=1)
+    run_id = queue.create_run(model_path, [("a", pd.DataFrame({"학번": ["1"]}))])
+
+    assert queue.claim("w1")[:2] == (run_id, 0)
+    time.sleep(LEASE_SECONDS * 1.5)
+
+    # 재시도 횟수를 다 쓴 채로 임대가 끝나면 다시 가져가지 않고 실패로 확정
+    assert queue.claim("w2") is None
+    assert shard_state(queue, run_id, 0) == {
+        "status": "failed", "attempts": 1, "worker": "w1", "error": "임대 시간 초과",
+    }
+    assert queue.progress(run_id) == {"queued": 0, "running": 0, "done": 0, "failed": 1}
@@ -0,0 +1,37 @@
+import numpy as np
+import pandas as pd
+
+from components import cache_paths, snapshots
+from components.group_distributions import compute_group_distributions
+
+
+def test_group_distributions_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(cache_paths, "CACHE_ROOT", tmp_path)
+    data = pd.DataFrame({
+        "학년": np.arange(300) % 4 + 1,
+        "학점": np.linspace(0, 4.5, 300),
+        "전공": np.where(np.arange(300) % 3 == 0, "경영", "컴퓨터공학"),
+        "성취 수준": np.array(["저성취", "중성취", "고성취"])[np.arange(300) % 3],
+    })
+    group_distributions = compute_group_distributions(data)
+
+    snapshots.write_group_distributions(group_distributions, "key")
+    loaded = snapshots.load_group_distributions("key")
+
+    assert list(loaded) == list(group_distributions)
+    for feature, ratios in group_distributions.items():
+        pd.testing.assert_frame_equal(loaded[feature], ratios)
+
+
+def test_prune_keeps_temp_files(tmp_path, monkeypatch):
+    # 다른 세션이 쓰는 중인 임시 파일은 정리 대상이 아님
+    monkeypatch.setattr(cache_paths, "CACHE_ROOT", tmp_path)
+    temp_path = cache_paths.cache_dir("snapshots/indexes") / "other.sort.arrow.0123abcd.tmp"
+    temp_path.write_bytes(b"partial")
+    stale_path = cache_paths.cache_dir("snapshots/indexes") / "other.sort.arrow"
+    stale_path.write_bytes(b"old")
+
+    snapshots.prune_snapshots()
+
+    assert temp_path.exists()
+    assert not stale_path.exists()
@@ -0,0 +1,36 @@
+import sqlite3
+
+import pandas as pd
+
+from components.student_db import ConnectionPool, fetch_changed_rows
+
+
+def make_db(path, updated_at):
+    data = pd.DataFrame({"학번": range(1, 13), "전공": [1, 2, 3] * 4, "updated_at": updated_at})
+    with sqlite3.connect(path) as conn:
+        data.to_sql("students", conn, index=False)
+    conn.close()
+
+
+def test_integer_columns_over_several_batches(tmp_path):
+    # 학번/수정 시각이 INTEGER 인 테이블에서 배치 경계를 넘어도 모든 행을 가져와야 함
+    path = tmp_path / "students.db"
+    make_db(path, [1, 1, 1, 2, 2, 2, 2, 3, 3, 3, 4, 4])
+    pool = ConnectionPool(str(path))
+
+    changed, watermark = fetch_changed_rows(pool, "students", "updated_at", batch_size=5)
+
+    assert sorted(changed["학번"].astype(int)) == list(range(1, 13))
+    assert watermark == (4, 12)
+    assert all(type(value) is int for value in watermark)
+
+
+def test_incremental_fetch_from_watermark(tmp_path):
+    path = tmp_path / "students.db"
+    make_db(path, list(range(100, 112)))
+    pool = ConnectionPool(str(path))
+
+    changed, watermark = fetch_changed_rows(pool, "students", "updated_at", watermark=(103, 4), batch_size=3)
+
+    assert sorted(changed["학번"].astype(int)) == list(range(5, 13))
+    assert watermark == (111, 12)